@@ -0,0 +1,1126 @@
+import argparse
+import heapq
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from task1 import LinkedList
+from task3 import EDGE_RECORD, ContractionHierarchy, CSRGraph, Graph, read_edge_list
+
+
+class _UnslottedNode:
+    """Linked list node without __slots__, used as the memory baseline."""
+
+    def __init__(self, data: Optional[int] = None) -> None:
+        self.data = data
+        self.next = None
+
+
+def measure(func: Callable[[], object]) -> tuple[float, int]:
+    """Run a function twice, measuring its wall time and then its peak memory.
+
+    The function is timed without tracemalloc, since tracing slows down
+    allocation-heavy code several times.
+
+    :param func: Function without arguments to run.
+    :return: Tuple with elapsed seconds and peak traced memory in bytes.
+    """
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    del result
+
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak
+
+
+def build_linked_list(n: int) -> LinkedList:
+    """Build a linked list of n values with insert_at_end."""
+    llist = LinkedList()
+    for i in range(n):
+        llist.insert_at_end(i)
+    return llist
+
+
+def build_unslotted_chain(n: int) -> _UnslottedNode:
+    """Build a chain of n unslotted nodes with a tail pointer."""
+    head = tail = _UnslottedNode(0)
+    for i in range(1, n):
+        tail.next = _UnslottedNode(i)
+        tail = tail.next
+    return head
+
+
+def build_by_walking(n: int) -> _UnslottedNode:
+    """Build a chain of n unslotted nodes walking to the end on every append."""
+    head = _UnslottedNode(0)
+    for i in range(1, n):
+        cur = head
+        while cur.next:
+            cur = cur.next
+        cur.next = _UnslottedNode(i)
+    return head
+
+
+def bench_linked_list_build(n: int = 10**6, walk_n: int = 10000) -> None:
+    """Compare building a LinkedList with the tail pointer and slotted nodes
+    against unslotted nodes and the old walk-to-the-end append.
+
+    :param n: Number of nodes for the memory and build-time comparison.
+    :param walk_n: Number of nodes for the quadratic walk-to-the-end baseline.
+    """
+    print(f"Building linked lists of {n} nodes:")
+    elapsed, peak = measure(lambda: build_linked_list(n))
+    print(f"  slotted nodes, tail pointer:   {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+    elapsed, peak = measure(lambda: build_unslotted_chain(n))
+    print(f"  unslotted nodes, tail pointer: {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+
+    print(f"Building linked lists of {walk_n} nodes:")
+    elapsed, _ = measure(lambda: build_linked_list(walk_n))
+    print(f"  tail pointer append:           {elapsed:8.3f} s")
+    elapsed, _ = measure(lambda: build_by_walking(walk_n))
+    print(f"  walk-to-the-end append:        {elapsed:8.3f} s")
+
+
+def bench_linked_list_sort(n: int = 10**6, insertion_n: int = 5000, seed: int = 42) -> None:
+    """Compare merge_sort on random and nearly sorted input with insertion_sort.
+
+    :param n: Number of nodes for merge sort.
+    :param insertion_n: Number of nodes for the quadratic insertion sort.
+    :param seed: Seed for the random input.
+    """
+    rng = random.Random(seed)
+    values = [rng.random() for _ in range(n)]
+    nearly_sorted = sorted(values)
+    for _ in range(n // 1000):
+        i, j = rng.randrange(n), rng.randrange(n)
+        nearly_sorted[i], nearly_sorted[j] = nearly_sorted[j], nearly_sorted[i]
+
+    print(f"Sorting linked lists of {n} nodes:")
+    for label, data in (("random", values), ("nearly sorted", nearly_sorted)):
+        llist = LinkedList()
+        for value in data:
+            llist.insert_at_end(value)
+        start = time.perf_counter()
+        llist.merge_sort()
+        print(f"  merge_sort, {label + ':':14} {time.perf_counter() - start:8.3f} s")
+
+    print(f"Sorting linked lists of {insertion_n} nodes:")
+    for method in ("merge_sort", "insertion_sort"):
+        llist = LinkedList()
+        for value in values[:insertion_n]:
+            llist.insert_at_end(value)
+        start = time.perf_counter()
+        getattr(llist, method)()
+        print(f"  {method + ':':26} {time.perf_counter() - start:8.3f} s")
+
+
+def bench_linked_list_index(n: int = 10**5, queries: int = 500, seed: int = 42) -> None:
+    """Compare search_element and delete_node with and without the value index.
+
+    :param n: Number of nodes in the list.
+    :param queries: Number of searches and of deletions.
+    :param seed: Seed for the random input.
+    """
+    rng = random.Random(seed)
+    values = rng.sample(range(10 * n), n)
+    lookups = [rng.choice(values) for _ in range(queries)]
+    deletions = rng.sample(values, queries)
+
+    print(f"Searching and deleting {queries} values in linked lists of {n} nodes:")
+    for indexed in (False, True):
+        llist = LinkedList(indexed=indexed)
+        for value in values:
+            llist.insert_at_end(value)
+        start = time.perf_counter()
+        for value in lookups:
+            llist.search_element(value)
+        search_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for value in deletions:
+            llist.delete_node(value)
+        delete_time = time.perf_counter() - start
+        label = "indexed:" if indexed else "unindexed:"
+        print(f"  {label:11} search {search_time:8.3f} s  delete {delete_time:8.3f} s")
+
+    # Duplicates: the index has to find the first of many nodes holding the value
+    print(f"Deleting the first of {2 * n} equal values {queries} times:")
+    for indexed in (False, True):
+        llist = LinkedList(indexed=indexed)
+        for _ in range(2 * n):
+            llist.insert_at_end(0)
+        start = time.perf_counter()
+        for _ in range(queries):
+            llist.delete_node(0)
+        label = "indexed:" if indexed else "unindexed:"
+        print(f"  {label:11} delete {time.perf_counter() - start:8.3f} s")
+
+
+def random_graph(n: int, m: int, seed: int = 42, max_weight: int = 100) -> Graph:
+    """Generate a connected random graph with n vertices and about m edges.
+
+    A random spanning tree keeps the graph connected; the remaining edges
+    join random pairs of vertices.
+
+    :param n: Number of vertices.
+    :param m: Number of edges.
+    :param seed: Seed for the random generator.
+    :param max_weight: Largest edge weight.
+    :return: The generated graph.
+    """
+    rng = random.Random(seed)
+    graph = Graph()
+    for vertex in range(1, n):
+        graph.add_edge(f"v{rng.randrange(vertex)}", f"v{vertex}", rng.randint(1, max_weight))
+    for _ in range(m - n + 1):
+        graph.add_edge(f"v{rng.randrange(n)}", f"v{rng.randrange(n)}", rng.randint(1, max_weight))
+    return graph
+
+
+def dict_dijkstra(edges: dict, start: str) -> tuple[dict, dict]:
+    """Dijkstra's algorithm on the adjacency dictionary, used as the baseline.
+
+    :param edges: Dictionary mapping vertices to lists of (neighbor, weight).
+    :param start: The starting vertex.
+    :return: Tuple with distances and previous vertices.
+    """
+    distances = {vertex: float("infinity") for vertex in edges}
+    previous = {vertex: None for vertex in edges}
+    distances[start] = 0
+    heap = [(0, start)]
+    while heap:
+        current_distance, current_vertex = heapq.heappop(heap)
+        if current_distance > distances[current_vertex]:
+            continue
+        for neighbor, weight in edges[current_vertex]:
+            distance = current_distance + weight
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                previous[neighbor] = current_vertex
+                heapq.heappush(heap, (distance, neighbor))
+    return distances, previous
+
+
+def bench_graph_csr(n: int = 10**5, m: int = 5 * 10**5) -> None:
+    """Compare the adjacency dictionary and the CSR form of a graph.
+
+    :param n: Number of vertices.
+    :param m: Number of edges.
+    """
+    graph = random_graph(n, m)
+    print(f"Graph with {n} vertices and {m} edges:")
+    elapsed, peak = measure(lambda: CSRGraph.from_edges(graph.edges))
+    print(f"  freezing to CSR:       {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+    elapsed, peak = measure(lambda: dict_dijkstra(graph.edges, "v0"))
+    print(f"  dictionary dijkstra:   {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+    csr = graph.freeze()
+    elapsed, peak = measure(lambda: csr.dijkstra_ids(0))
+    print(f"  CSR dijkstra (ids):    {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+    elapsed, peak = measure(lambda: csr.dijkstra("v0"))
+    print(f"  CSR dijkstra (names):  {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+
+
+def grid_graph(side: int, seed: int = 42) -> Graph:
+    """Generate a road-like grid graph with vertex coordinates.
+
+    Neighbouring vertices are 10 units apart and their edge weights are at
+    least that, so the straight-line heuristic is admissible.
+
+    :param side: Number of vertices along each side of the grid.
+    :param seed: Seed for the random generator.
+    :return: The generated graph.
+    """
+    rng = random.Random(seed)
+    graph = Graph()
+    for row in range(side):
+        for col in range(side):
+            vertex = f"{row},{col}"
+            graph.set_coordinates(vertex, col * 10, row * 10)
+            if col + 1 < side:
+                graph.add_edge(vertex, f"{row},{col + 1}", rng.randint(10, 15))
+            if row + 1 < side:
+                graph.add_edge(vertex, f"{row + 1},{col}", rng.randint(10, 15))
+    return graph
+
+
+def bench_graph_point_to_point(side: int = 300, queries: int = 20, seed: int = 42) -> None:
+    """Compare full Dijkstra with the point-to-point search methods on a grid.
+
+    :param side: Number of vertices along each side of the grid.
+    :param queries: Number of random source-target queries.
+    :param seed: Seed for the random queries.
+    """
+    graph = grid_graph(side, seed)
+    graph.freeze()
+    rng = random.Random(seed)
+    vertices = list(graph.edges)
+    pairs = [(rng.choice(vertices), rng.choice(vertices)) for _ in range(queries)]
+
+    print(f"{queries} point-to-point queries on a {side}x{side} grid:")
+    start = time.perf_counter()
+    for source, _ in pairs:
+        graph.dijkstra(source)
+    print(f"  full dijkstra:  {time.perf_counter() - start:8.3f} s  {len(vertices) * queries:10} settled")
+    for method in ("dijkstra", "bidirectional", "astar"):
+        start = time.perf_counter()
+        settled = sum(graph.shortest_path(source, target, method=method)[2] for source, target in pairs)
+        print(f"  {method + ':':15} {time.perf_counter() - start:8.3f} s  {settled:10} settled")
+
+
+def bench_contraction_hierarchy(side: int = 60, queries: int = 500, seed: int = 42) -> None:
+    """Measure contraction hierarchy preprocessing, index size and query latency.
+
+    :param side: Number of vertices along each side of the grid.
+    :param queries: Number of random source-target queries.
+    :param seed: Seed for the random graph and queries.
+    """
+    graph = grid_graph(side, seed)
+    rng = random.Random(seed)
+    vertices = list(graph.edges)
+    pairs = [(rng.choice(vertices), rng.choice(vertices)) for _ in range(queries)]
+
+    print(f"Contraction hierarchy on a {side}x{side} grid:")
+    start = time.perf_counter()
+    hierarchy = graph.contraction_hierarchy()
+    print(f"  preprocessing:       {time.perf_counter() - start:8.3f} s")
+    print(f"  index size:          {hierarchy.index_size() / 2**20:8.3f} MiB, {len(hierarchy.targets)} upward edges")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "graph.ch")
+        hierarchy.save(path)
+        start = time.perf_counter()
+        hierarchy = ContractionHierarchy.load(path)
+        print(f"  loading from disk:   {time.perf_counter() - start:8.3f} s")
+
+    start = time.perf_counter()
+    for source, target in pairs:
+        hierarchy.distance(source, target)
+    latency = (time.perf_counter() - start) / queries
+    print(f"  hierarchy query:     {latency * 1e6:8.1f} us")
+    start = time.perf_counter()
+    for source, target in pairs[: queries // 10]:
+        graph.shortest_path(source, target)
+    latency = (time.perf_counter() - start) / (queries // 10)
+    print(f"  dijkstra query:      {latency * 1e6:8.1f} us")
+
+
+def bench_graph_many_sources(n: int = 20000, m: int = 100000, sources: int = 64) -> None:
+    """Compare a loop of Graph.dijkstra calls with dijkstra_many and distance_matrix.
+
+    :param n: Number of vertices.
+    :param m: Number of edges.
+    :param sources: Number of starting vertices.
+    """
+    graph = random_graph(n, m)
+    names = list(graph.edges)[:sources]
+    workers = os.cpu_count() or 1
+    print(f"Distances from {sources} sources in a graph with {n} vertices and {m} edges:")
+
+    start = time.perf_counter()
+    for source in names:
+        graph.dijkstra(source)
+    print(f"  dijkstra loop:                  {time.perf_counter() - start:8.3f} s")
+    start = time.perf_counter()
+    for _ in graph.dijkstra_many(names, workers=workers):
+        pass
+    print(f"  dijkstra_many, {workers:3} workers:     {time.perf_counter() - start:8.3f} s")
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        graph.distance_matrix(os.path.join(directory, "matrix.bin"), names, workers=workers)
+        print(f"  distance_matrix, {workers:3} workers:   {time.perf_counter() - start:8.3f} s")
+
+
+def bench_dijkstra_queues(n: int = 50000, m: int = 250000, max_weight: int = 10) -> None:
+    """Compare the priority queue backends of Dijkstra's algorithm.
+
+    :param n: Number of vertices.
+    :param m: Number of edges.
+    :param max_weight: Largest edge weight.
+    """
+    graph = random_graph(n, m, max_weight=max_weight)
+    graph.freeze()
+    print(f"Dijkstra on a graph with {n} vertices, {m} edges and weights up to {max_weight}:")
+    for queue, arity in (("heapq", 4), ("dary", 2), ("dary", 4), ("dary", 8), ("buckets", 4)):
+        stats: dict = {}
+        start = time.perf_counter()
+        graph.dijkstra("v0", queue=queue, arity=arity, stats=stats)
+        elapsed = time.perf_counter() - start
+        label = f"{queue}-{arity}:" if queue == "dary" else f"{queue}:"
+        print(
+            f"  {label:9} {elapsed:8.3f} s  "
+            f"pushes {stats['pushes']:8}  pops {stats['pops']:8}  stale {stats['stale']:8}"
+        )
+
+
+def bench_dijkstra_cache(n: int = 10000, m: int = 50000, sources: int = 8, updates: int = 20) -> None:
+    """Compare cached and repaired shortest-path trees with full reruns after add_edge.
+
+    :param n: Number of vertices.
+    :param m: Number of edges.
+    :param sources: Number of starting vertices queried after every update.
+    :param updates: Number of rounds of queries, each followed by one add_edge.
+    """
+    print(f"Dijkstra from {sources} sources, {updates} rounds of one add_edge each, {n} vertices:")
+    for label, cache_size in (("cached:", 32), ("uncached:", 0)):
+        graph = random_graph(n, m)
+        graph.cache_size = cache_size
+        names = list(graph.edges)[:sources]
+        rng = random.Random(42)
+        start = time.perf_counter()
+        for _ in range(updates):
+            for source in names:
+                graph.dijkstra(source)
+            graph.add_edge(f"v{rng.randrange(n)}", f"v{rng.randrange(n)}", rng.randint(1, 100))
+        print(f"  {label:10} {time.perf_counter() - start:8.3f} s  {graph.cache_stats}")
+
+
+def bench_graph_loading(n: int = 10**5, m: int = 10**6, seed: int = 42) -> None:
+    """Compare add_edge loading with the public Graph loaders for edge lists and the binary format.
+
+    :param n: Number of vertices.
+    :param m: Number of edges.
+    :param seed: Seed for the random edges.
+    """
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = os.path.join(directory, "edges.txt")
+        records_path = os.path.join(directory, "edges.bin")
+        binary_path = os.path.join(directory, "graph.bin")
+        edges = [(rng.randrange(n), rng.randrange(n), rng.randint(1, 100)) for _ in range(m)]
+        with open(text_path, "w") as file:
+            for from_id, to_id, weight in edges:
+                file.write(f"{from_id} {to_id} {weight}\n")
+        with open(records_path, "wb") as file:
+            for record in edges:
+                file.write(EDGE_RECORD.pack(*record))
+        del edges
+
+        def add_edges() -> Graph:
+            graph = Graph()
+            for from_vertex, to_vertex, weight in read_edge_list(text_path):
+                graph.add_edge(from_vertex, to_vertex, weight)
+            return graph.freeze()
+
+        print(f"Loading {m} edges between {n} vertices:")
+        elapsed, peak = measure(add_edges)
+        print(f"  add_edge loop and freeze:       {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+        elapsed, peak = measure(lambda: Graph.load_edge_list(text_path))
+        print(f"  Graph.load_edge_list, text:     {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+        elapsed, peak = measure(lambda: Graph.load_edge_list(records_path, binary=True))
+        print(f"  Graph.load_edge_list, binary:   {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+        Graph.load_edge_list(text_path).save(binary_path)
+        elapsed, peak = measure(lambda: Graph.load(binary_path))
+        print(f"  Graph.load:                     {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+        elapsed, peak = measure(lambda: Graph.load(binary_path).dijkstra("0"))
+        print(f"  Graph.load and one dijkstra:    {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+        # The adjacency dictionary is built on the first change
+        elapsed, peak = measure(lambda: Graph.load(binary_path).add_edge("0", "1", 1))
+        print(f"  Graph.load and one add_edge:    {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+
+
+def bench_heap_layout(n: int = 10**5) -> None:
+    """Compare the Node tree layout with the array-indexed heap layout.
+
+    :param n: Number of heap elements.
+    """
+    import networkx as nx
+
+    from shared_funcs import add_edges, heap_graph, heap_position, heap_positions, list_to_heap_tree
+
+    heap_list = list(range(n))
+
+    def node_layout():
+        root = list_to_heap_tree(heap_list)
+        pos = {root.id: (0, 0)}
+        return add_edges(nx.DiGraph(), root, pos), pos
+
+    def array_layout():
+        return heap_graph(n), {index: heap_position(index) for index in range(n)}
+
+    def vectorized_layout():
+        return heap_graph(n), dict(enumerate(heap_positions(n).tolist()))
+
+    print(f"Laying out a heap of {n} elements:")
+    elapsed, peak = measure(node_layout)
+    print(f"  Node tree:           {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+    elapsed, peak = measure(array_layout)
+    print(f"  heap array:          {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+    elapsed, peak = measure(vectorized_layout)
+    print(f"  heap array, NumPy:   {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+    elapsed, peak = measure(lambda: heap_positions(n))
+    print(f"  NumPy positions:     {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+
+
+def bench_traversal_animation(n: int = 2000, redraw_steps: int = 10) -> None:
+    """Time export_traversal end to end against redrawing the whole figure for every frame.
+
+    :param n: Number of tree nodes, which is also the number of frames.
+    :param redraw_steps: Number of full redraws timed to estimate the cost of n of them.
+    """
+    from shared_funcs import list_to_heap_tree, tree_figure
+    from task5 import export_traversal
+
+    print(f"Exporting a labeled traversal of a tree with {n} nodes, {n} frames:")
+    figure, *_ = tree_figure(list_to_heap_tree(list(range(n))))
+    start = time.perf_counter()
+    for _ in range(redraw_steps):
+        figure.canvas.draw()
+    per_frame = (time.perf_counter() - start) / redraw_steps
+    print(f"  full redraw per frame:  {per_frame * n:8.2f} s  (estimated from {redraw_steps} frames)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "traversal.gif")
+        elapsed, peak = measure(lambda: export_traversal(list_to_heap_tree(list(range(n))), path))
+        size = os.path.getsize(path)
+        print(f"  export_traversal, GIF:  {elapsed:8.2f} s  {peak / 2**20:8.1f} MiB  file {size / 2**20:.1f} MiB")
+
+
+def bench_heap_engine(n: int = 10**6, seed: int = 42) -> None:
+    """Compare task4.Heap with heapq on heapify, pushes and pops.
+
+    :param n: Number of values, 10**6 by default; 10**7 takes minutes in pure Python.
+    :param seed: Seed for the random values.
+    """
+    from task4 import Heap
+
+    rng = random.Random(seed)
+    values = [rng.random() for _ in range(n)]
+    print(f"Heap operations on {n} floats:")
+
+    def run_heapq():
+        data = list(values)
+        heapq.heapify(data)
+        for value in values[: n // 10]:
+            heapq.heappush(data, value)
+        for _ in range(n // 10):
+            heapq.heappop(data)
+        return data
+
+    elapsed, peak = measure(run_heapq)
+    print(f"  heapq:                       {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+
+    for arity in (2, 4, 8):
+        for typecode in (None, "d"):
+
+            def run_heap():
+                heap = Heap(values, arity=arity, typecode=typecode)
+                for value in values[: n // 10]:
+                    heap.push(value)
+                for _ in range(n // 10):
+                    heap.pop()
+                return heap
+
+            storage = "array" if typecode else "list"
+            elapsed, peak = measure(run_heap)
+            print(f"  Heap, arity {arity}, {storage:5} storage: {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+
+
+def bench_fractal(levels: tuple[int, ...] = (12, 16, 20)) -> None:
+    """Compare recursive per-branch segment generation with the vectorized and streaming task2 modes.
+
+    :param levels: Recursion levels of the tree.
+    """
+    from task2 import branch_segments, export_tree, render_tree
+
+    def recursive_segments(level):
+        # Same walk as task2.draw_branch, with the turtle replaced by coordinates
+        segments = []
+
+        def branch(x, y, heading, length, level):
+            if level == 0:
+                return
+            end_x = x + length * math.cos(math.radians(heading))
+            end_y = y + length * math.sin(math.radians(heading))
+            segments.append(((x, y), (end_x, end_y)))
+            branch(end_x, end_y, heading + 45, length * math.cos(math.radians(45)), level - 1)
+            branch(end_x, end_y, heading - 45, length * math.cos(math.radians(45)), level - 1)
+
+        branch(0, -250, 90, 100, level)
+        return segments
+
+    with tempfile.TemporaryDirectory() as directory:
+        for level in levels:
+            print(f"Fractal tree of level {level} ({2**level - 1} segments):")
+            elapsed, peak = measure(lambda: recursive_segments(level))
+            print(f"  recursive segments:  {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+            elapsed, peak = measure(lambda: branch_segments(level))
+            print(f"  vectorized segments: {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+            start = time.perf_counter()
+            render_tree(level, os.path.join(directory, "tree.png"))
+            print(f"  render to PNG:       {time.perf_counter() - start:8.3f} s")
+            elapsed, peak = measure(lambda: export_tree(level, os.path.join(directory, "tree.seg"), resolution=10**9))
+            print(f"  stream to .seg:      {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+
+
+def table_knapsack(items: dict, budget: int) -> tuple[list[str], int]:
+    """The 0/1 knapsack with the full (n + 1) x (budget + 1) table, used as the baseline.
+
+    :param items: Dictionary with products.
+    :param budget: Budget that can be spent on products.
+    :return: Tuple with selected products and total calories.
+    """
+    names = list(items)
+    costs = [items[name]["cost"] for name in names]
+    calories = [items[name]["calories"] for name in names]
+    dp = [[0] * (budget + 1) for _ in range(len(names) + 1)]
+    for i in range(1, len(names) + 1):
+        for w in range(1, budget + 1):
+            if costs[i - 1] <= w:
+                dp[i][w] = max(dp[i - 1][w], dp[i - 1][w - costs[i - 1]] + calories[i - 1])
+            else:
+                dp[i][w] = dp[i - 1][w]
+    w = budget
+    chosen = []
+    for i in range(len(names), 0, -1):
+        if dp[i][w] != dp[i - 1][w]:
+            chosen.append(names[i - 1])
+            w -= costs[i - 1]
+    return chosen, dp[len(names)][budget]
+
+
+def random_items(n: int, max_cost: int, seed: int = 42) -> dict:
+    """Generate a catalog of n items with random costs and calories.
+
+    :param n: Number of items.
+    :param max_cost: Largest cost of an item.
+    :param seed: Seed for the random costs and calories.
+    :return: Dictionary with products in the format of task6.ITEMS.
+    """
+    rng = random.Random(seed)
+    return {f"item{i}": {"cost": rng.randint(1, max_cost), "calories": rng.randint(1, 1000)} for i in range(n)}
+
+
+def bench_knapsack(sizes: tuple[tuple[int, int], ...] = ((200, 5000), (2000, 10**5), (2000, 10**6))) -> None:
+    """Compare the full-table knapsack with the rolling-row task6.dynamic_programming.
+
+    The full table is only run while it fits in about a million cells.
+
+    :param sizes: Pairs of catalog size and budget.
+    """
+    from task6 import dynamic_programming
+
+    for n, budget in sizes:
+        items = random_items(n, 4 * budget // n)
+        print(f"Knapsack of {n} items with budget {budget}:")
+        if n * budget <= 10**6:
+            elapsed, peak = measure(lambda: table_knapsack(items, budget))
+            print(f"  full table:   {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+        elapsed, peak = measure(lambda: dynamic_programming(items, budget))
+        print(f"  rolling row:  {elapsed:8.3f} s  {peak / 2**20:8.1f} MiB")
+
+
+def bench_knapsack_budgets(n: int = 1000, max_budget: int = 10**5, tiers: int = 10) -> None:
+    """Compare a dynamic_programming call per budget tier with one cached task6.budget_table, with and without bits.
+
+    :param n: Number of items.
+    :param max_budget: The largest budget tier.
+    :param tiers: Number of evenly spaced budget tiers.
+    """
+    from task6 import budget_table, dynamic_programming
+
+    items = random_items(n, 4 * max_budget // n)
+    budgets = [max_budget * (i + 1) // tiers for i in range(tiers)]
+    print(f"Knapsack of {n} items for {tiers} budgets up to {max_budget}:")
+
+    start = time.perf_counter()
+    for budget in budgets:
+        dynamic_programming(items, budget)
+    print(f"  solve per budget:        {time.perf_counter() - start:8.3f} s")
+
+    start = time.perf_counter()
+    table = budget_table(items, max_budget)
+    for budget in budgets:
+        table.total_calories(budget)
+    print(f"  one table, calories:     {time.perf_counter() - start:8.3f} s")
+    start = time.perf_counter()
+    for budget in budgets:
+        table.chosen_items(budget)
+    print(f"  one table, items:        {time.perf_counter() - start:8.3f} s")
+    start = time.perf_counter()
+    table = budget_table(items, max_budget)
+    for budget in budgets:
+        table.solve(budget)
+    print(f"  cached table, again:     {time.perf_counter() - start:8.3f} s")
+
+    start = time.perf_counter()
+    table = budget_table(items, max_budget, keep_decisions=True)
+    for budget in budgets:
+        table.solve(budget)
+    print(f"  decision bits, items:    {time.perf_counter() - start:8.3f} s  {table.decisions.nbytes / 2**20:8.1f} MiB")
+
+
+def bench_knapsack_strategies(
+    sizes: tuple[int, ...] = (10, 100, 1000), budgets: tuple[int, ...] = (10**3, 10**5, 10**7), max_cells: int = 10**9
+) -> None:
+    """Time every task6.knapsack strategy over a grid of catalog sizes and budgets.
+
+    Item costs grow with the budget, like prices in cents, while calories
+    stay below 1000. A DP is skipped when its row times the items exceeds
+    max_cells.
+
+    :param sizes: Numbers of items.
+    :param budgets: Budgets.
+    :param max_cells: Largest DP run.
+    """
+    from task6 import choose_strategy, knapsack
+
+    print(f"{'items':>6} {'budget':>10} {'cost DP':>9} {'calorie DP':>11} {'B&B':>9}  auto")
+    for n in sizes:
+        for budget in budgets:
+            items = random_items(n, max(1, 4 * budget // n))
+            total = sum(item["calories"] for item in items.values())
+            cells = {"cost": n * (budget + 1), "calories": n * (total + 1), "branch_and_bound": 0}
+            times = []
+            for strategy, strategy_cells in cells.items():
+                if strategy_cells > max_cells:
+                    times.append(f"{'-':>9}")
+                    continue
+                start = time.perf_counter()
+                knapsack(items, budget, strategy)
+                times.append(f"{time.perf_counter() - start:8.3f}s")
+            print(f"{n:6} {budget:10} {times[0]:>9} {times[1]:>11} {times[2]:>9}  {choose_strategy(items, budget)}")
+
+
+def loop_monte_carlo(num_simulations: int) -> dict[int, float]:
+    """Roll two dice with random.randint per trial, used as the baseline.
+
+    :param num_simulations: The number of simulations to run.
+    :return: A dictionary with the sum of the dice as keys and the probability as values.
+    """
+    sum_counts = {i: 0 for i in range(2, 12 + 1)}
+    for _ in range(num_simulations):
+        sum_counts[random.randint(1, 6) + random.randint(1, 6)] += 1
+    return {sum_val: count / num_simulations * 100 for sum_val, count in sum_counts.items()}
+
+
+def bench_monte_carlo(loop_n: int = 10**6, n: int = 10**8) -> None:
+    """Compare the throughput of the per-trial loop with the chunked task7 engine.
+
+    :param loop_n: Number of trials for the loop.
+    :param n: Number of trials for the engine.
+    """
+    from task7 import monte_carlo_simulation
+
+    print("Monte Carlo trials per second:")
+    elapsed, peak = measure(lambda: loop_monte_carlo(loop_n))
+    print(f"  loop, 2 dice:                {loop_n / elapsed / 1e6:8.2f} M/s  {peak / 2**20:8.1f} MiB")
+    for dice, faces in ((2, 6), (10, 6), (3, 100)):
+        elapsed, peak = measure(lambda: monte_carlo_simulation(n // dice, dice, faces, seed=42))
+        print(f"  chunked, {dice:2} dice, {faces:3} faces: {n // dice / elapsed / 1e6:8.2f} M/s  {peak / 2**20:8.1f} MiB")
+
+
+def bench_monte_carlo_workers(n: int = 4 * 10**8, workers: tuple[int, ...] = (1, 2, 4, 8)) -> None:
+    """Measure the throughput of the task7 engine on process pools of several sizes.
+
+    :param n: Number of trials.
+    :param workers: Pool sizes to try.
+    """
+    from task7 import simulate_sums
+
+    print(f"Monte Carlo with {n} trials of 2 dice on {os.cpu_count()} CPUs:")
+    reference = None
+    for count in workers:
+        start = time.perf_counter()
+        counts = simulate_sums(n, seed=42, workers=count)
+        elapsed = time.perf_counter() - start
+        # The same seed gives the same counts for any number of workers
+        identical = reference is None or (counts == reference).all()
+        reference = counts if reference is None else reference
+        print(f"  {count:2} workers: {n / elapsed / 1e6:8.2f} M/s  identical: {identical}")
+
+
+def bench_monte_carlo_adaptive(fixed_n: int = 10**8, errors: tuple[float, ...] = (0.1, 0.05, 0.02)) -> None:
+    """Compare a fixed-size task7 simulation with adaptive stopping, and time exact distributions.
+
+    :param fixed_n: Number of trials of the fixed run.
+    :param errors: Target errors of the adaptive runs, in percentage points.
+    """
+    from task7 import adaptive_simulation, monte_carlo_simulation, sum_distribution
+
+    print("Exact distribution by convolution:")
+    for dice, faces in ((2, 6), (300, 6), (300, 100)):
+        for method in ("direct", "fft"):
+            start = time.perf_counter()
+            sum_distribution(dice, faces, method)
+            print(f"  {dice:3} dice, {faces:3} faces, {method:6}: {time.perf_counter() - start:8.4f} s")
+
+    print("Simulation of 2 dice:")
+    start = time.perf_counter()
+    monte_carlo_simulation(fixed_n, seed=42)
+    print(f"  fixed run:          {fixed_n:12} trials  {time.perf_counter() - start:8.3f} s")
+    for error in errors:
+        start = time.perf_counter()
+        _, n = adaptive_simulation(target_error=error, seed=42)
+        print(f"  adaptive, +-{error:<5}: {n:12} trials  {time.perf_counter() - start:8.3f} s")
+
+
+# Scaling cases: each builds the shared input for a size once and returns a function that
+# prepares one untimed run and returns the job to time
+def scale_linked_list_insert(size: int, seed: int) -> Callable[[], Callable[[], object]]:
+    """task1.LinkedList.insert_at_end, size appends."""
+    return lambda: lambda: build_linked_list(size)
+
+
+def scale_linked_list_sort(size: int, seed: int) -> Callable[[], Callable[[], object]]:
+    """task1.LinkedList.merge_sort on size random values."""
+    rng = random.Random(seed)
+    values = [rng.random() for _ in range(size)]
+
+    def make_job():
+        llist = LinkedList()
+        for value in values:
+            llist.insert_at_end(value)
+        return llist.merge_sort
+
+    return make_job
+
+
+def scale_dijkstra(size: int, seed: int) -> Callable[[], Callable[[], object]]:
+    """task3.Graph.dijkstra on a random graph with size vertices and 5 * size edges."""
+    graph = random_graph(size, 5 * size, seed)
+    graph.cache_size = 0
+    graph.freeze()
+    return lambda: lambda: graph.dijkstra("v0")
+
+
+def scale_list_to_heap_tree(size: int, seed: int) -> Callable[[], Callable[[], object]]:
+    """shared_funcs.list_to_heap_tree on a heap list of size values."""
+    from shared_funcs import list_to_heap_tree
+
+    values = list(range(size))
+    return lambda: lambda: list_to_heap_tree(values)
+
+
+def scale_traversal(order: str) -> Callable[[int, int], Callable[[], Callable[[], object]]]:
+    """Build the scaling case of a task5 traversal of a heap tree with size nodes."""
+
+    def case(size, seed):
+        from shared_funcs import list_to_heap_tree
+        from task5 import TRAVERSALS
+
+        root = list_to_heap_tree(list(range(size)))
+        return lambda: lambda: deque(TRAVERSALS[order](root), maxlen=0)
+
+    case.__doc__ = f"task5 {order} traversal of a heap tree with size nodes."
+    return case
+
+
+def scale_dynamic_programming(size: int, seed: int) -> Callable[[], Callable[[], object]]:
+    """task6.dynamic_programming with size items and a budget of 50 * size."""
+    from task6 import dynamic_programming
+
+    items = random_items(size, 100, seed)
+    return lambda: lambda: dynamic_programming(items, 50 * size)
+
+
+def scale_greedy_algorithm(size: int, seed: int) -> Callable[[], Callable[[], object]]:
+    """task6.greedy_algorithm with size items and a budget of 50 * size."""
+    from task6 import greedy_algorithm
+
+    items = random_items(size, 100, seed)
+    return lambda: lambda: greedy_algorithm(items, 50 * size)
+
+
+def scale_monte_carlo(size: int, seed: int) -> Callable[[], Callable[[], object]]:
+    """task7.monte_carlo_simulation with size trials of 2 dice."""
+    from task7 import monte_carlo_simulation
+
+    return lambda: lambda: monte_carlo_simulation(size, seed=seed)
+
+
+SCALING_CASES = {
+    "linked_list_insert": (scale_linked_list_insert, (10**4, 4 * 10**4, 16 * 10**4, 64 * 10**4)),
+    "linked_list_sort": (scale_linked_list_sort, (10**4, 4 * 10**4, 16 * 10**4, 64 * 10**4)),
+    "dijkstra": (scale_dijkstra, (5000, 20000, 80000)),
+    "list_to_heap_tree": (scale_list_to_heap_tree, (10**4, 4 * 10**4, 16 * 10**4, 64 * 10**4)),
+    "traversal_dfs": (scale_traversal("dfs"), (10**4, 4 * 10**4, 16 * 10**4, 64 * 10**4)),
+    "traversal_bfs": (scale_traversal("bfs"), (10**4, 4 * 10**4, 16 * 10**4, 64 * 10**4)),
+    "dynamic_programming": (scale_dynamic_programming, (250, 500, 1000, 2000)),
+    "greedy_algorithm": (scale_greedy_algorithm, (10**4, 4 * 10**4, 16 * 10**4, 64 * 10**4)),
+    "monte_carlo_simulation": (scale_monte_carlo, (10**6, 4 * 10**6, 16 * 10**6, 64 * 10**6)),
+}
+
+COMPLEXITY_MODELS = {
+    "O(1)": lambda n: 1.0,
+    "O(log n)": math.log,
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * math.log(n),
+    "O(n^2)": lambda n: n**2,
+    "O(n^2 log n)": lambda n: n**2 * math.log(n),
+    "O(n^3)": lambda n: n**3,
+}
+
+
+def fit_complexity(sizes: list[int], seconds: list[float]) -> tuple[float, str]:
+    """Fit how the running time grows with the size.
+
+    :param sizes: Input sizes.
+    :param seconds: Running time at each size.
+    :return: Tuple with the exponent k of the least-squares fit seconds ~ c * size**k
+             on a log-log scale, and the model of COMPLEXITY_MODELS closest to the
+             times on that scale.
+    """
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(elapsed, 1e-9)) for elapsed in seconds]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    exponent = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance if variance else 0.0
+
+    def error(model):
+        # Residuals of log(seconds) against log(c * model(size)) with the best c
+        residuals = [y - math.log(model(size)) for size, y in zip(sizes, ys)]
+        mean = sum(residuals) / len(residuals)
+        return sum((residual - mean) ** 2 for residual in residuals)
+
+    return exponent, min(COMPLEXITY_MODELS, key=lambda name: error(COMPLEXITY_MODELS[name]))
+
+
+def run_scaling(names: Optional[list[str]] = None, seed: int = 42, repeat: int = 3) -> dict[str, dict]:
+    """Run scaling cases at increasing sizes and fit their complexity.
+
+    Every size is timed repeat times, keeping the fastest run, and run once
+    more under tracemalloc for the peak memory.
+
+    :param names: Keys of SCALING_CASES, all of them by default.
+    :param seed: Seed for the generated inputs.
+    :param repeat: Number of timed runs per size.
+    :return: Dictionary by case with the sizes, seconds, peak bytes, fitted exponent and complexity.
+    """
+    results = {}
+    for name in names or SCALING_CASES:
+        case, sizes = SCALING_CASES[name]
+        seconds, peaks = [], []
+        for size in sizes:
+            make_job = case(size, seed)
+            best = math.inf
+            for _ in range(repeat):
+                job = make_job()
+                start = time.perf_counter()
+                job()
+                best = min(best, time.perf_counter() - start)
+            job = make_job()
+            tracemalloc.start()
+            job()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            seconds.append(best)
+            peaks.append(peak)
+        exponent, complexity = fit_complexity(list(sizes), seconds)
+        results[name] = {
+            "sizes": list(sizes),
+            "seconds": seconds,
+            "peak_bytes": peaks,
+            "exponent": exponent,
+            "complexity": complexity,
+        }
+        print(f"{name}: {complexity}, time ~ n^{exponent:.2f}")
+        for size, elapsed, peak in zip(sizes, seconds, peaks):
+            print(f"  {size:10}  {elapsed:8.4f} s  {peak / 2**20:8.1f} MiB")
+    return results
+
+
+def save_results(path: str, results: dict[str, dict], seed: int) -> None:
+    """Save scaling results as JSON, with the environment they were measured in.
+
+    :param path: Path of the file to write.
+    :param results: Results of run_scaling.
+    :param seed: Seed the inputs were generated with.
+    """
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "results": results,
+    }
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
+
+
+def load_results(path: str) -> dict[str, dict]:
+    """Load the results saved with save_results.
+
+    :param path: Path of the file to read.
+    :return: Dictionary by case, in the format of run_scaling.
+    """
+    with open(path) as file:
+        return json.load(file)["results"]
+
+
+def compare_to_baseline(
+    results: dict[str, dict],
+    baseline: dict[str, dict],
+    tolerance: float = 0.25,
+    exponent_tolerance: float = 0.3,
+    min_seconds: float = 0.002,
+    min_bytes: int = 1 << 16,
+) -> list[str]:
+    """Find cases that got slower, use more memory or scale worse than in the baseline.
+
+    Differences below min_seconds and min_bytes are ignored as noise.
+
+    :param results: Results of run_scaling.
+    :param baseline: Earlier results, e.g. from load_results.
+    :param tolerance: Allowed relative growth of time and memory.
+    :param exponent_tolerance: Allowed growth of the fitted exponent.
+    :param min_seconds: Smallest time difference that counts.
+    :param min_bytes: Smallest memory difference that counts.
+    :return: A message for every regression.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]
+        base_seconds = dict(zip(base["sizes"], base["seconds"]))
+        base_peaks = dict(zip(base["sizes"], base["peak_bytes"]))
+        for size, elapsed, peak in zip(result["sizes"], result["seconds"], result["peak_bytes"]):
+            if size not in base_seconds:
+                continue
+            old = base_seconds[size]
+            if elapsed > old * (1 + tolerance) and elapsed - old > min_seconds:
+                regressions.append(f"{name} at {size}: {elapsed:.4f} s, baseline {old:.4f} s")
+            old = base_peaks[size]
+            if peak > old * (1 + tolerance) and peak - old > min_bytes:
+                regressions.append(f"{name} at {size}: {peak / 2**20:.1f} MiB, baseline {old / 2**20:.1f} MiB")
+        if result["exponent"] > base["exponent"] + exponent_tolerance:
+            regressions.append(
+                f"{name}: time ~ n^{result['exponent']:.2f} ({result['complexity']}), "
+                f"baseline n^{base['exponent']:.2f} ({base['complexity']})"
+            )
+    return regressions
+
+
+COMPUTE_MODULES = ("task1", "task2", "task3", "task4", "task5", "task6", "task7", "shared_funcs")
+# Loaded only by the draw and report functions, never on import
+LAZY_DEPENDENCIES = ("matplotlib", "networkx", "pandas", "tkinter")
+IMPORT_BUDGET_SECONDS = 0.3
+
+_IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, [name for name in {lazy!r} if name in sys.modules]]))
+"""
+
+
+def measure_import(module: str, repeat: int = 3) -> tuple[float, list[str]]:
+    """Import a module in fresh interpreters, timing the import and listing the lazy dependencies it loaded.
+
+    :param module: Name of the module to import.
+    :param repeat: Number of interpreters; the fastest import is taken.
+    :return: Tuple with the import time in seconds and the names of loaded lazy dependencies.
+    """
+    code = _IMPORT_PROBE.format(module=module, lazy=LAZY_DEPENDENCIES)
+    directory = os.path.dirname(os.path.abspath(__file__))
+    best, loaded = math.inf, []
+    for _ in range(repeat):
+        command = [sys.executable, "-c", code]
+        output = subprocess.run(command, capture_output=True, text=True, check=True, cwd=directory).stdout
+        elapsed, loaded = json.loads(output)
+        best = min(best, elapsed)
+    return best, loaded
+
+
+def check_imports(
+    modules: tuple[str, ...] = COMPUTE_MODULES, budget: float = IMPORT_BUDGET_SECONDS, repeat: int = 3
+) -> list[str]:
+    """Check that the modules import within the time budget and without the plotting and tabulation dependencies.
+
+    :param modules: Names of the modules to import.
+    :param budget: Allowed import time of every module in seconds.
+    :param repeat: Number of imports per module; the fastest one is checked.
+    :return: A message for every violation.
+    """
+    violations = []
+    for module in modules:
+        elapsed, loaded = measure_import(module, repeat)
+        print(f"  {module:13} {elapsed * 1000:8.1f} ms  {', '.join(loaded) or '-'}")
+        if elapsed > budget:
+            violations.append(f"{module}: import takes {elapsed:.3f} s, budget {budget:.3f} s")
+        if loaded:
+            violations.append(f"{module}: import loads {', '.join(loaded)}")
+    return violations
+
+
+def bench_imports() -> None:
+    """Print the import time of every module and the lazy dependencies it loads."""
+    print("Import time in a fresh interpreter:")
+    for message in check_imports():
+        print(f"  VIOLATION {message}")
+
+
+BENCHMARKS = {
+    "linked_list_build": bench_linked_list_build,
+    "linked_list_sort": bench_linked_list_sort,
+    "linked_list_index": bench_linked_list_index,
+    "graph_csr": bench_graph_csr,
+    "graph_point_to_point": bench_graph_point_to_point,
+    "contraction_hierarchy": bench_contraction_hierarchy,
+    "graph_many_sources": bench_graph_many_sources,
+    "dijkstra_queues": bench_dijkstra_queues,
+    "dijkstra_cache": bench_dijkstra_cache,
+    "graph_loading": bench_graph_loading,
+    "heap_layout": bench_heap_layout,
+    "traversal_animation": bench_traversal_animation,
+    "heap_engine": bench_heap_engine,
+    "fractal": bench_fractal,
+    "knapsack": bench_knapsack,
+    "knapsack_budgets": bench_knapsack_budgets,
+    "knapsack_strategies": bench_knapsack_strategies,
+    "monte_carlo": bench_monte_carlo,
+    "monte_carlo_workers": bench_monte_carlo_workers,
+    "monte_carlo_adaptive": bench_monte_carlo_adaptive,
+    "imports": bench_imports,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the benchmarks given by name, or all of them.")
+    parser.add_argument("names", nargs="*", help="Benchmarks to run, or scaling cases with --scaling.")
+    parser.add_argument("--scaling", action="store_true", help="Run the scaling cases and fit their complexity.")
+    parser.add_argument("--json", help="Save the scaling results to this file, e.g. to use as a baseline.")
+    parser.add_argument("--baseline", help="Compare the scaling results with a saved JSON file.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown against the baseline.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per size of a scaling case.")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the generated inputs.")
+    parser.add_argument("--imports", action="store_true", help="Check the import time budget of the modules.")
+    parser.add_argument("--budget", type=float, default=IMPORT_BUDGET_SECONDS, help="Allowed import time in seconds.")
+    args = parser.parse_args()
+
+    if args.imports:
+        print("Import time in a fresh interpreter:")
+        violations = check_imports(tuple(args.names) or COMPUTE_MODULES, args.budget, args.repeat)
+        for message in violations:
+            print(f"VIOLATION {message}")
+        sys.exit(1 if violations else 0)
+
+    if not args.scaling:
+        for name in args.names or BENCHMARKS:
+            BENCHMARKS[name]()
+        sys.exit()
+
+    results = run_scaling(args.names, args.seed, args.repeat)
+    if args.json:
+        save_results(args.json, results, args.seed)
+    if args.baseline:
+        regressions = compare_to_baseline(results, load_results(args.baseline), args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        # A non-zero exit status fails a CI job
+        sys.exit(1 if regressions else 0)
@@ -1,6 +1,15 @@
-import uuid
-import networkx as nx
-import matplotlib.pyplot as plt
+import itertools
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+# networkx and matplotlib are imported by the drawing functions that use them,
+# so the tree and heap helpers load without them.
+if TYPE_CHECKING:
+    import networkx as nx
+
+# Source of unique node ids, much cheaper than a uuid per node
+_node_ids = itertools.count()
 
 
 class Node:
@@ -15,11 +24,14 @@ class Node:
         self.right = None
         self.val = key
         self.color = color
-        self.id = str(uuid.uuid4())
+        self.id = next(_node_ids)
 
 
 def add_edges(graph, node, pos, x=0, y=0, layer=1):
-    """Recursively add nodes and edges from the binary tree to the graph.
+    """Add nodes and edges from the binary tree to the graph.
+
+    The tree is walked with an explicit stack and the graph is filled with
+    one batch call for the nodes and one for the edges.
 
     :param graph: NetworkX directed graph.
     :param node: Current tree node.
@@ -29,19 +41,21 @@ def add_edges(graph, node, pos, x=0, y=0, layer=1):
     :param layer: current depth level in the tree.
     :return: updated graph.
     """
-
-    if node is not None:
-        graph.add_node(node.id, color=node.color, label=node.val)
-        if node.left:
-            graph.add_edge(node.id, node.left.id)
-            l = x - 1 / 2**layer
-            pos[node.left.id] = (l, y - 1)
-            l = add_edges(graph, node.left, pos, x=l, y=y - 1, layer=layer + 1)
-        if node.right:
-            graph.add_edge(node.id, node.right.id)
-            r = x + 1 / 2**layer
-            pos[node.right.id] = (r, y - 1)
-            r = add_edges(graph, node.right, pos, x=r, y=y - 1, layer=layer + 1)
+    nodes = []
+    edges = []
+    stack = [(node, x, y, layer)] if node is not None else []
+    while stack:
+        node, x, y, layer = stack.pop()
+        nodes.append((node.id, {"color": node.color, "label": node.val}))
+        # Push the right child first, so the left subtree is added first
+        for child, direction in ((node.right, 1), (node.left, -1)):
+            if child:
+                edges.append((node.id, child.id))
+                child_x = x + direction / 2**layer
+                pos[child.id] = (child_x, y - 1)
+                stack.append((child, child_x, y - 1, layer + 1))
+    graph.add_nodes_from(nodes)
+    graph.add_edges_from(edges)
     return graph
 
 
@@ -50,6 +64,9 @@ def draw_tree(tree_root):
 
     :param tree_root: The root node of the tree.
     """
+    import matplotlib.pyplot as plt
+    import networkx as nx
+
     tree = nx.DiGraph()
     pos = {tree_root.id: (0, 0)}
     tree = add_edges(tree, tree_root, pos)
@@ -62,6 +79,114 @@ def draw_tree(tree_root):
     plt.show()
 
 
+def node_size(count: int) -> int:
+    """Pick a node size that keeps the drawing readable, 2500 for small trees.
+
+    :param count: Number of nodes drawn.
+    :return: Node size for NetworkX drawing functions.
+    """
+    return max(1, min(2500, 20000 // max(count, 1)))
+
+
+def tree_figure(tree_root, labels=True):
+    """Draw the binary tree once on an offscreen figure, for animations.
+
+    The figure is not attached to pyplot or any display. Node colors can
+    then be changed through the returned collection without redrawing
+    the tree.
+
+    :param tree_root: The root node of the tree.
+    :param labels: Whether to print the values on the nodes.
+    :return: Tuple with the figure, the node collection, the list of node
+             ids in the order of the collection and the list of label texts
+             in the same order, empty without labels.
+    """
+    import networkx as nx
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    tree = nx.DiGraph()
+    pos = {tree_root.id: (0, 0)}
+    tree = add_edges(tree, tree_root, pos)
+    node_ids = list(tree.nodes)
+    colors = [tree.nodes[node_id]["color"] for node_id in node_ids]
+
+    figure = Figure(figsize=(8, 5))
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+    ax.set_axis_off()
+    collection = nx.draw_networkx_nodes(
+        tree, pos, nodelist=node_ids, node_size=node_size(len(node_ids)), node_color=colors, ax=ax
+    )
+    nx.draw_networkx_edges(tree, pos, arrows=False, ax=ax)
+    texts = []
+    if labels:
+        node_labels = {node_id: tree.nodes[node_id]["label"] for node_id in node_ids}
+        label_texts = nx.draw_networkx_labels(tree, pos, labels=node_labels, ax=ax)
+        texts = [label_texts[node_id] for node_id in node_ids]
+    return figure, collection, node_ids, texts
+
+
+def heap_position(index: int) -> tuple[float, float]:
+    """Compute the position of a heap element in the same layout as add_edges.
+
+    The element at index i is on depth d = floor(log2(i + 1)) at offset
+    p = i + 1 - 2**d within its level, which gives x = (2p + 1) / 2**d - 1.
+
+    :param index: Index of the element in the heap list.
+    :return: The (x, y) position of the element.
+    """
+    depth = (index + 1).bit_length() - 1
+    offset = index + 1 - (1 << depth)
+    return (2 * offset + 1) / 2**depth - 1, -depth
+
+
+def heap_positions(size: int) -> np.ndarray:
+    """Compute the positions of all elements of a heap at once, as heap_position does for one.
+
+    :param size: Number of elements in the heap.
+    :return: Array of shape (size, 2) with the (x, y) position of every index.
+    """
+    index = np.arange(1, size + 1)
+    depth = np.frexp(index)[1] - 1  # floor(log2(i + 1)), exact for integer input
+    offset = index - np.left_shift(1, depth)
+    return np.column_stack(((2 * offset + 1) / np.exp2(depth) - 1, -depth))
+
+
+def heap_graph(size: int) -> "nx.DiGraph":
+    """Build the tree of a heap list as a graph whose nodes are the list indices.
+
+    :param size: Number of elements in the heap.
+    :return: NetworkX directed graph with an edge from every parent to its children.
+    """
+    import networkx as nx
+
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(size))
+    graph.add_edges_from(((index - 1) // 2, index) for index in range(1, size))
+    return graph
+
+
+def draw_heap(heap_list: list[int], colors=None, labels=True):
+    """Draw a binary heap straight from its list, without building a tree of Nodes.
+
+    :param heap_list: List of integers representing the binary heap.
+    :param colors: Color of each element, or None to draw all of them skyblue.
+    :param labels: Whether to print the values on the nodes.
+    """
+    import matplotlib.pyplot as plt
+    import networkx as nx
+
+    size = len(heap_list)
+    tree = heap_graph(size)
+    pos = dict(enumerate(heap_positions(size).tolist()))
+
+    plt.figure(figsize=(8, 5))
+    options = {"labels": dict(enumerate(heap_list))} if labels else {"with_labels": False}
+    nx.draw(tree, pos=pos, arrows=False, node_size=node_size(size), node_color=colors or "skyblue", **options)
+    plt.show()
+
+
 def list_to_heap_tree(arr: list[int], element_index=0):
     """Convert a list representation of a binary heap to a tree.
 
@@ -72,9 +197,17 @@ def list_to_heap_tree(arr: list[int], element_index=0):
     if element_index >= len(arr):
         return None
     # Create a new node for the current element.
-    node = Node(arr[element_index])
-
-    # Recursively build the left and right subtrees.
-    node.left = list_to_heap_tree(arr, 2 * element_index + 1)
-    node.right = list_to_heap_tree(arr, 2 * element_index + 2)
-    return node
+    root = Node(arr[element_index])
+
+    # Build the subtrees with an explicit stack of (list index, node).
+    stack = [(element_index, root)]
+    while stack:
+        index, node = stack.pop()
+        left, right = 2 * index + 1, 2 * index + 2
+        if left < len(arr):
+            node.left = Node(arr[left])
+            stack.append((left, node.left))
+        if right < len(arr):
+            node.right = Node(arr[right])
+            stack.append((right, node.right))
+    return root
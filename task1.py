@@ -1,7 +1,10 @@
-from typing import Optional
+import heapq
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
 
 
 class Node:
+    __slots__ = ("data", "next")
+
     def __init__(self, data: Optional[int] = None) -> None:
         """Initialize a node with data.
 
@@ -12,10 +15,133 @@ class Node:
 
 
 class LinkedList:
-    def __init__(self) -> None:
-        """Initialize an empty linked list."""
+    def __init__(self, indexed: bool = False) -> None:
+        """Initialize an empty linked list.
+
+        :param indexed: Keep a hash index from values to nodes, so that
+                        search_element and delete_node run in O(1) on average
+                        for unique values. With duplicates they walk the list
+                        up to the first node holding the value. Values must be
+                        hashable in this mode.
+        """
+
+        self._head: Optional[Node] = None
+        self.tail: Optional[Node] = None  # Last node, kept for O(1) appends
+        self.size: int = 0  # Number of nodes in the list
+        # Value -> nodes holding it, and node -> its predecessor (indexed mode only).
+        # The nodes of a value are dict keys, so a node is found and removed in O(1).
+        self._index: Optional[dict[Any, dict[Node, None]]] = {} if indexed else None
+        self._prev: Optional[dict[Node, Optional[Node]]] = {} if indexed else None
+
+    @property
+    def indexed(self) -> bool:
+        """Whether the list keeps a value index."""
+        return self._index is not None
+
+    @property
+    def head(self) -> Optional[Node]:
+        """The first node of the list."""
+        return self._head
 
-        self.head: Optional[Node] = None
+    @head.setter
+    def head(self, node: Optional[Node]) -> None:
+        """Replace the whole chain, e.g. with the result of merge_sorted_lists.
+
+        The new chain is walked once to recompute the tail and the size.
+
+        :param node: The head node of the new chain.
+        """
+        self._head = node
+        self.tail = None
+        self.size = 0
+        while node:
+            self.tail = node
+            self.size += 1
+            node = node.next
+        self._rebuild_index()
+
+    def __len__(self) -> int:
+        """Return the number of nodes in the list."""
+        return self.size
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the values of the list from head to tail."""
+        for node in iter_nodes(self._head):
+            yield node.data
+
+    def _index_add(self, node: Node, prev: Optional[Node]) -> None:
+        """Register a newly linked node in the value index.
+
+        :param node: The node that was linked into the list.
+        :param prev: The node before it, or None if it is the head.
+        """
+        if self._index is None:
+            return
+        self._index.setdefault(node.data, {})[node] = None
+        self._prev[node] = prev
+        if node.next:
+            self._prev[node.next] = node
+
+    def _rebuild_index(self) -> None:
+        """Rebuild the value index from scratch after the chain was relinked."""
+        if self._index is None:
+            return
+        self._index = {}
+        self._prev = {}
+        prev: Optional[Node] = None
+        current = self._head
+        while current:
+            self._index.setdefault(current.data, {})[current] = None
+            self._prev[current] = prev
+            prev = current
+            current = current.next
+
+    def _find_indexed(self, key: Any) -> tuple[Optional[Node], Optional[Node]]:
+        """Find the first node with the given value using the value index.
+
+        A unique value is found in O(1). The index does not know the list
+        order of duplicates, so with several nodes holding the value the list
+        is walked from the head up to the first of them: O(p) for the first
+        one at position p, never further than a linear scan.
+
+        :param key: The value to search for.
+        :return: Tuple with the node and its predecessor, or (None, None).
+        """
+        nodes = self._index.get(key)
+        if not nodes:
+            return None, None
+        if len(nodes) == 1:
+            node = next(iter(nodes))
+            return node, self._prev[node]
+        prev: Optional[Node] = None
+        current = self._head
+        while current not in nodes:
+            prev = current
+            current = current.next
+        return current, prev
+
+    def _unlink(self, prev: Optional[Node], node: Node) -> None:
+        """Remove a node from the list.
+
+        :param prev: The node before the removed one, or None if it is the head.
+        :param node: The node to remove.
+        """
+        if prev is None:
+            self._head = node.next  # Change head to next node
+        else:
+            prev.next = node.next
+        if node is self.tail:
+            self.tail = prev
+        self.size -= 1
+
+        if self._index is not None:
+            nodes = self._index[node.data]
+            del nodes[node]
+            if not nodes:
+                del self._index[node.data]
+            del self._prev[node]
+            if node.next:
+                self._prev[node.next] = prev
 
     def insert_at_beginning(self, data: int) -> None:
         """Insert a new node at the beginning of the list.
@@ -23,8 +149,12 @@ class LinkedList:
         :param data: The value to insert.
         """
         new_node = Node(data)  # Create a new node
-        new_node.next = self.head  # Point new node's next to current head
-        self.head = new_node  # Make new node the new head
+        new_node.next = self._head  # Point new node's next to current head
+        self._head = new_node  # Make new node the new head
+        if self.tail is None:
+            self.tail = new_node  # First node is also the last one
+        self.size += 1
+        self._index_add(new_node, None)
 
     def insert_at_end(self, data: int) -> None:
         """Insert a new node at the end of the list.
@@ -32,14 +162,14 @@ class LinkedList:
         :param data: The value to insert.
         """
         new_node = Node(data)  # Create a new node
-        if self.head is None:
-            self.head = new_node  # If list is empty, new node becomes head
+        prev = self.tail
+        if prev is None:
+            self._head = new_node  # If list is empty, new node becomes head
         else:
-            cur = self.head
-            # Traverse to the last node
-            while cur.next:
-                cur = cur.next
-            cur.next = new_node  # Add new node at the end
+            prev.next = new_node  # Add new node after the current tail
+        self.tail = new_node
+        self.size += 1
+        self._index_add(new_node, prev)
 
     def insert_after(self, prev_node: Node, data: int) -> None:
         """Insert a new node after a given node.
@@ -53,17 +183,28 @@ class LinkedList:
         new_node = Node(data)  # Create a new node
         new_node.next = prev_node.next  # Point new node's next to previous node's next
         prev_node.next = new_node  # Link previous node to the new node
+        if prev_node is self.tail:
+            self.tail = new_node
+        self.size += 1
+        self._index_add(new_node, prev_node)
 
     def delete_node(self, key: int) -> None:
         """Delete the first node that has the given value.
 
         :param key: The value to be deleted.
         """
-        cur = self.head
+        if self._index is not None:
+            # Look the node and its predecessor up in the value index
+            cur, prev = self._find_indexed(key)
+            if cur is not None:
+                self._unlink(prev, cur)
+            return
+
+        cur = self._head
 
         # If head node holds the key to be deleted
         if cur and cur.data == key:
-            self.head = cur.next  # Change head to next node
+            self._unlink(None, cur)
             cur = None  # Free old head
             return
 
@@ -78,7 +219,7 @@ class LinkedList:
             return
 
         # Unlink the node from the linked list
-        prev.next = cur.next
+        self._unlink(prev, cur)
         cur = None
 
     def search_element(self, data: int) -> Optional[Node]:
@@ -87,7 +228,10 @@ class LinkedList:
         :param data: The value to search for.
         :return: The node if found, otherwise None.
         """
-        cur = self.head
+        if self._index is not None:
+            return self._find_indexed(data)[0]
+
+        cur = self._head
         while cur:
             if cur.data == data:
                 return cur  # Node found
@@ -107,14 +251,16 @@ class LinkedList:
     def reverse(self) -> None:
         """Reverse the linked list."""
         prev: Optional[Node] = None
-        current = self.head
+        current = self._head
+        self.tail = current  # Old head becomes the last node
         # Change next of each node to previous node
         while current:
             next_node = current.next  # Save next node
             current.next = prev  # Reverse the link
             prev = current  # Move prev to current node
             current = next_node  # Move to next node
-        self.head = prev  # Update head to the new first node
+        self._head = prev  # Update head to the new first node
+        self._rebuild_index()
 
     def sorted_insert(self, new_node: Node) -> None:
         """Insert a node into the sorted linked list.
@@ -122,30 +268,76 @@ class LinkedList:
         :param new_node: The node to insert.
         """
         # If the list is empty or new node should be first
-        if self.head is None or self.head.data >= new_node.data:
-            new_node.next = self.head
-            self.head = new_node
+        if self._head is None or self._head.data >= new_node.data:
+            new_node.next = self._head
+            self._head = new_node
         else:
-            current = self.head
+            current = self._head
             # Find the node after which new_node should be inserted
             while current.next and current.next.data < new_node.data:
                 current = current.next
             new_node.next = current.next
             current.next = new_node
+        if new_node.next is None:
+            self.tail = new_node  # Inserted at the end
+        self.size += 1
+        self._index_add(new_node, None if self._head is new_node else current)
 
     def insertion_sort(self) -> None:
         """
         Sort the linked list using insertion sort.
         """
         sorted_list = LinkedList()  # Create a new empty sorted list
-        current = self.head
+        current = self._head
         # Traverse the original list and insert nodes in sorted order
         while current:
             next_node = current.next  # Save next node
             current.next = None  # Disconnect the node from the list
             sorted_list.sorted_insert(current)
             current = next_node
-        self.head = sorted_list.head  # Update head to the sorted list's head
+        # Take over the sorted chain together with its tail and size
+        self._head, self.tail, self.size = sorted_list.head, sorted_list.tail, sorted_list.size
+        self._rebuild_index()
+
+    def merge_sort(self) -> None:
+        """
+        Sort the linked list in place using natural bottom-up merge sort.
+
+        The list is split into its already sorted runs, which are then merged
+        pairwise with merge_sorted_lists until one run is left. Existing nodes
+        are relinked, the sort is stable and uses no recursion. Runs in O(n log r)
+        for r runs, so nearly sorted input is sorted in close to linear time.
+        """
+        if self._head is None:
+            return
+
+        # Cut the list into non-decreasing runs, remembering head and tail of each
+        runs: list[tuple[Node, Node]] = []
+        current = self._head
+        while current:
+            run_head = current
+            while current.next and current.next.data >= current.data:
+                current = current.next
+            next_node = current.next
+            current.next = None  # Detach the run from the rest of the list
+            runs.append((run_head, current))
+            current = next_node
+
+        # Merge neighbouring runs level by level, left run first to stay stable
+        while len(runs) > 1:
+            merged_runs: list[tuple[Node, Node]] = []
+            for i in range(0, len(runs) - 1, 2):
+                (left_head, left_tail), (right_head, right_tail) = runs[i], runs[i + 1]
+                merged_head = merge_sorted_lists(left_head, right_head)
+                # On ties the left node goes first, so the right tail ends up last
+                merged_tail = left_tail if left_tail.data > right_tail.data else right_tail
+                merged_runs.append((merged_head, merged_tail))
+            if len(runs) % 2:
+                merged_runs.append(runs[-1])  # Odd run waits for the next level
+            runs = merged_runs
+
+        self._head, self.tail = runs[0]
+        self._rebuild_index()
 
 
 def merge_sorted_lists(list1: Optional[Node], list2: Optional[Node]) -> Optional[Node]:
@@ -177,6 +369,63 @@ def merge_sorted_lists(list1: Optional[Node], list2: Optional[Node]) -> Optional
     return dummy.next  # Return the merged list, skipping dummy node
 
 
+def iter_nodes(head: Optional[Node]) -> Iterator[Node]:
+    """Iterate over the nodes of a chain starting at head.
+
+    The next node is read before the current one is yielded, so the caller
+    may relink the yielded node without breaking the iteration.
+
+    :param head: The head node of the chain.
+    :return: Iterator over the nodes.
+    """
+    current = head
+    while current:
+        next_node = current.next  # Save next node before handing this one out
+        yield current
+        current = next_node
+
+
+def merge_sorted_iterables(
+    *sources: Union[LinkedList, Iterable[Any]], key: Optional[Callable[[Any], Any]] = None
+) -> Iterator[Any]:
+    """Lazily merge any number of sorted linked lists or iterables.
+
+    Uses a heap holding one value per source, so it runs in O(N log K) for
+    N values in K sources and keeps only K values in memory. The merge is
+    stable: equal values come out in the order of their sources.
+
+    :param sources: Sorted LinkedLists or other sorted iterables.
+    :param key: Function extracting the comparison key from a value.
+    :return: Iterator over the merged values.
+    """
+    return heapq.merge(*sources, key=key)
+
+
+def merge_k_sorted_lists(
+    heads: Iterable[Optional[Node]], key: Optional[Callable[[Any], Any]] = None
+) -> Optional[Node]:
+    """Merge any number of sorted linked lists into one sorted list in place.
+
+    The existing nodes are relinked, no new nodes are created. Runs in
+    O(N log K) and is stable like merge_sorted_iterables.
+
+    :param heads: The head nodes of the sorted lists.
+    :param key: Function extracting the comparison key from a node value.
+    :return: The head node of the merged sorted list.
+    """
+    node_key = (lambda node: node.data) if key is None else (lambda node: key(node.data))
+    dummy = Node()  # Create a dummy node to start the merged list
+    tail = dummy  # Tail will point to the last node in the merged list
+
+    # Attach nodes in the order the heap hands them out
+    for node in heapq.merge(*(iter_nodes(head) for head in heads), key=node_key):
+        tail.next = node
+        tail = node
+    tail.next = None
+
+    return dummy.next  # Return the merged list, skipping dummy node
+
+
 if __name__ == "__main__":
 
     # Create first sorted linked list: 1 -> 3 -> 5
@@ -199,6 +448,21 @@ if __name__ == "__main__":
     print("Merged sorted list:")
     merged_list.print_list()
 
+    # Merge several sorted lists at once
+    shards = []
+    for values in ([1, 4, 7], [2, 5, 8], [3, 6, 9]):
+        shard = LinkedList()
+        for i in values:
+            shard.insert_at_end(i)
+        shards.append(shard)
+    print("Lazily merged sorted lists:")
+    print(list(merge_sorted_iterables(*shards)))
+
+    merged_list = LinkedList()
+    merged_list.head = merge_k_sorted_lists(shard.head for shard in shards)
+    print("Merged sorted lists:")
+    merged_list.print_list()
+
     # Create linked list: 5 -> 10 -> 15 -> 20 -> 25
     llist = LinkedList()
     for i in [5, 10, 15, 20, 25]:
@@ -222,3 +486,15 @@ if __name__ == "__main__":
     llist.insertion_sort()
     print(f"Linked list after insertion sort:")
     llist.print_list()
+
+    # New unsorted linked list
+    llist = LinkedList()
+    for i in [25, 5, 20, 10, 15]:
+        llist.insert_at_end(i)
+
+    print(f"Linked list before merge sort:")
+    llist.print_list()
+    # Sort linked list using merge sort
+    llist.merge_sort()
+    print(f"Linked list after merge sort:")
+    llist.print_list()
@@ -1,9 +1,18 @@
-import turtle
+import argparse
 import math
-from turtle import Turtle
+import os
+import struct
+from typing import TYPE_CHECKING, Iterator
 
+import numpy as np
 
-def draw_branch(t: Turtle, branch_length: float, angle: float, level: int) -> None:
+# turtle and matplotlib are imported by the drawing functions that use them,
+# so computing and streaming segments loads only numpy.
+if TYPE_CHECKING:
+    from turtle import Turtle
+
+
+def draw_branch(t: "Turtle", branch_length: float, angle: float, level: int) -> None:
     """Draw one branch of the tree recursively.
 
     :param t: Turtle used for drawing.
@@ -34,11 +43,15 @@ def draw_branch(t: Turtle, branch_length: float, angle: float, level: int) -> No
     t.backward(branch_length)
 
 
-def draw_tree(level: int) -> None:
+def draw_tree(level: int, branch_length: float = 100, angle: float = 45) -> None:
     """Initialize the turtle and draw the tree.
 
     :param level: The depth of recursion for drawing the tree.
+    :param branch_length: Length of the trunk.
+    :param angle: Angle used for left and right turns, in degrees.
     """
+    import turtle
+
     t = turtle.Turtle()
     t.speed("fastest")  # Set the fastest drawing speed
 
@@ -48,16 +61,316 @@ def draw_tree(level: int) -> None:
     t.pendown()
     t.left(90)  # Point the turtle upwards
 
-    # Start drawing the tree with a branch length of 100 and an angle of 45 degrees
-    draw_branch(t, 100, 45, level)
+    # Start drawing the tree with the given branch length and angle
+    draw_branch(t, branch_length, angle, level)
 
     turtle.done()  # Finish turtle graphics
 
 
+def branch_segments(
+    level: int,
+    branch_length: float = 100,
+    angle: float = 45,
+    origin: tuple[float, float] = (0, -250),
+    direction: tuple[float, float] = (0, 1),
+) -> np.ndarray:
+    """Compute all branch segments of the tree level by level, without recursion.
+
+    Every level scales the branch length by cos(angle) and turns the
+    direction of each branch by +angle (left) and -angle (right), so all
+    branches of one level are computed with one array operation.
+
+    :param level: The depth of recursion of the tree.
+    :param branch_length: Length of the trunk.
+    :param angle: Angle used for left and right turns, in degrees.
+    :param origin: Start point of the trunk.
+    :param direction: Unit vector of the trunk; upwards like in draw_tree by default.
+    :return: Array of shape (2**level - 1, 2, 2) with the start and end point of every branch.
+    """
+    segments = np.empty((max(2**level - 1, 0), 2, 2))
+    scale = math.cos(math.radians(angle))
+    left, right = _rotations(angle)
+
+    starts = np.array([origin], dtype=float)
+    directions = np.array([direction], dtype=float)
+    length = branch_length
+    offset = 0
+    for _ in range(level):
+        ends = starts + length * directions
+        count = len(starts)
+        segments[offset : offset + count, 0] = starts
+        segments[offset : offset + count, 1] = ends
+        offset += count
+        # Both children of every branch start at its end
+        starts = np.concatenate((ends, ends))
+        directions = np.concatenate((directions @ left, directions @ right))
+        length *= scale
+    return segments
+
+
+def _rotations(angle: float) -> tuple[np.ndarray, np.ndarray]:
+    """Return the matrices turning a row vector by +angle and -angle degrees."""
+    cos_a, sin_a = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+    left = np.array([[cos_a, sin_a], [-sin_a, cos_a]])
+    return left, left.T
+
+
+def iter_segments(
+    level: int,
+    branch_length: float = 100,
+    angle: float = 45,
+    origin: tuple[float, float] = (0, -250),
+    chunk_levels: int = 14,
+) -> Iterator[np.ndarray]:
+    """Yield the branch segments of the tree in chunks, walking it depth-first.
+
+    The upper levels are walked one branch at a time with an explicit
+    stack; every subtree of at most chunk_levels levels is computed at
+    once with branch_segments. Memory use depends on chunk_levels, not
+    on the depth of the tree.
+
+    :param level: The depth of recursion of the tree.
+    :param branch_length: Length of the trunk.
+    :param angle: Angle used for left and right turns, in degrees.
+    :param origin: Start point of the trunk, which points upwards.
+    :param chunk_levels: Depth of the subtrees computed at once, giving
+                         chunks of up to 2**chunk_levels segments.
+    :return: Iterator over arrays of shape (k, 2, 2) of segment start and end points.
+    """
+    scale = math.cos(math.radians(angle))
+    left, right = _rotations(angle)
+    chunk_size = 2**chunk_levels
+    buffer = []
+    # Every entry is the start point and direction of a branch, and its depth
+    stack = [(np.array(origin, dtype=float), np.array([0.0, 1.0]), 0)] if level > 0 else []
+    while stack:
+        start, direction, depth = stack.pop()
+        length = branch_length * scale**depth
+        if level - depth <= chunk_levels:
+            yield branch_segments(level - depth, length, angle, start, direction)
+            continue
+        end = start + length * direction
+        buffer.append((start, end))
+        if len(buffer) >= chunk_size:
+            yield np.array(buffer)
+            buffer = []
+        # Push the right branch first, so the left one is walked first like in draw_branch
+        stack.append((end, direction @ right, depth + 1))
+        stack.append((end, direction @ left, depth + 1))
+    if buffer:
+        yield np.array(buffer)
+
+
+def tree_bounds(
+    level: int, branch_length: float = 100, angle: float = 45, origin: tuple[float, float] = (0, -250)
+) -> tuple[float, float, float, float]:
+    """Estimate the bounding box of the tree without computing all of its segments.
+
+    The top 12 levels are computed exactly; the rest of the tree lies
+    within the reach of their outermost branches.
+
+    :param level: The depth of recursion of the tree.
+    :param branch_length: Length of the trunk.
+    :param angle: Angle used for left and right turns, in degrees.
+    :param origin: Start point of the trunk.
+    :return: Tuple (min_x, min_y, max_x, max_y).
+    """
+    top = min(level, 12)
+    points = branch_segments(top, branch_length, angle, origin).reshape(-1, 2)
+    if not len(points):
+        return origin[0], origin[1], origin[0], origin[1]
+    margin = _reach(branch_length, angle, top, level)
+    (min_x, min_y), (max_x, max_y) = points.min(axis=0), points.max(axis=0)
+    return min_x - margin, min_y - margin, max_x + margin, max_y + margin
+
+
+def _reach(branch_length: float, angle: float, depth: int, level: int) -> float:
+    """Return how far the branches below depth can reach from their start point."""
+    scale = abs(math.cos(math.radians(angle)))
+    return sum(branch_length * scale**k for k in range(depth, level))
+
+
+def visible_level(level: int, branch_length: float, angle: float, pixel_size: float) -> int:
+    """Find how many levels of the tree have branches of at least one pixel.
+
+    All branches of one depth have the same length, so once they are
+    shorter than a pixel the deeper levels can be skipped as a whole.
+
+    :param level: The depth of recursion of the tree.
+    :param branch_length: Length of the trunk.
+    :param angle: Angle used for left and right turns, in degrees.
+    :param pixel_size: Size of one output pixel in tree coordinates.
+    :return: The number of levels to draw.
+    """
+    scale = abs(math.cos(math.radians(angle)))
+    for depth in range(level):
+        if branch_length * scale**depth < pixel_size:
+            return depth
+    return level
+
+
+# Binary segment file: signature and segment count, then x0, y0, x1, y1 as float64 per segment
+SEGMENT_MAGIC = b"TREESEG1"
+SEGMENT_HEADER = struct.Struct("<8sq")
+
+
+def read_segments(path: str, chunk_size: int = 1 << 16) -> Iterator[np.ndarray]:
+    """Stream the segments of a binary segment file written by export_tree.
+
+    :param path: Path of the file to read.
+    :param chunk_size: Number of segments read at once.
+    :return: Iterator over arrays of shape (k, 2, 2) of segment start and end points.
+    """
+    with open(path, "rb") as file:
+        magic, count = SEGMENT_HEADER.unpack(file.read(SEGMENT_HEADER.size))
+        if magic != SEGMENT_MAGIC:
+            raise ValueError(f"{path} is not a segment file.")
+        for start in range(0, count, chunk_size):
+            data = file.read(min(chunk_size, count - start) * 32)
+            yield np.frombuffer(data, dtype="<f8").reshape(-1, 2, 2)
+
+
+def _write_binary(file, chunks: Iterator[np.ndarray]) -> int:
+    """Write segment chunks as a binary segment file and return the segment count."""
+    file.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, 0))
+    count = 0
+    for chunk in chunks:
+        file.write(chunk.astype("<f8").tobytes())
+        count += len(chunk)
+    # The count is only known at the end
+    file.seek(0)
+    file.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, count))
+    return count
+
+
+def _write_svg(file, chunks: Iterator[np.ndarray], bounds: tuple[float, float, float, float], resolution: int) -> int:
+    """Write segment chunks as an SVG file, one path per chunk, and return the segment count."""
+    min_x, min_y, max_x, max_y = bounds
+    width, height = max_x - min_x, max_y - min_y
+    ratio = resolution / max(width, height, 1e-12)
+    file.write(
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width * ratio:.0f}" height="{height * ratio:.0f}" '
+        f'viewBox="{min_x:.3f} {-max_y:.3f} {width:.3f} {height:.3f}">\n'
+    )
+    count = 0
+    for chunk in chunks:
+        # SVG y runs downwards
+        points = chunk.reshape(-1, 4) * (1, -1, 1, -1)
+        commands = ("M%.2f %.2fL%.2f %.2f" * len(points)) % tuple(points.ravel().tolist())
+        file.write(f'<path d="{commands}" stroke="black" stroke-width="{1 / ratio:.4f}" fill="none"/>\n')
+        count += len(chunk)
+    file.write("</svg>\n")
+    return count
+
+
+def _plot_segments(ax, segments: np.ndarray, level: int):
+    """Plot segments as one line separated by NaN points, which Agg draws many times faster than separate lines.
+
+    :return: The line.
+    """
+    points = np.full((len(segments), 3, 2), np.nan)
+    points[:, :2] = segments
+    points = points.reshape(-1, 2)
+    # Thinner lines for deep trees, otherwise the crown is a solid blot
+    (line,) = ax.plot(points[:, 0], points[:, 1], color="black", linewidth=max(0.1, 2.0 / max(level, 1) ** 0.5))
+    return line
+
+
+def render_tree(
+    level: int, path: str, branch_length: float = 100, angle: float = 45, size: tuple[float, float] = (8, 8), dpi: int = 100
+) -> int:
+    """Draw the whole tree offscreen in one call and save it to a file.
+
+    :param level: The depth of recursion of the tree.
+    :param path: Output file; the format follows the extension, e.g. ".png" or ".svg".
+    :param branch_length: Length of the trunk.
+    :param angle: Angle used for left and right turns, in degrees.
+    :param size: Figure size in inches.
+    :param dpi: Resolution of raster output.
+    :return: Number of segments drawn.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    segments = branch_segments(level, branch_length, angle)
+    figure = Figure(figsize=size)
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+    ax.set_axis_off()
+    ax.set_aspect("equal")
+    _plot_segments(ax, segments, level)
+    figure.savefig(path, dpi=dpi)
+    return len(segments)
+
+
+def export_tree(level: int, path: str, branch_length: float = 100, angle: float = 45, resolution: int = 800) -> int:
+    """Stream the tree to a file, skipping branches too small to be seen at the resolution.
+
+    Segments go to the file chunk by chunk, so memory use does not grow
+    with the level. A ".seg" file gets the binary segment format read by
+    read_segments, ".svg" is written directly, and any other extension,
+    e.g. ".png", is rasterized with matplotlib chunk by chunk.
+
+    :param level: The depth of recursion of the tree.
+    :param path: Output file.
+    :param branch_length: Length of the trunk.
+    :param angle: Angle used for left and right turns, in degrees.
+    :param resolution: Size of the longer side of the output in pixels.
+    :return: Number of segments written.
+    """
+    min_x, min_y, max_x, max_y = tree_bounds(level, branch_length, angle)
+    # Leave a margin, so the outermost branches are not cut by the edge
+    pad = 0.01 * max(max_x - min_x, max_y - min_y)
+    bounds = min_x - pad, min_y - pad, max_x + pad, max_y + pad
+    pixel_size = max(bounds[2] - bounds[0], bounds[3] - bounds[1]) / resolution
+    level = visible_level(level, branch_length, angle, pixel_size)
+    chunks = iter_segments(level, branch_length, angle)
+
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix == ".seg":
+        with open(path, "wb") as file:
+            return _write_binary(file, chunks)
+    if suffix == ".svg":
+        with open(path, "w") as file:
+            return _write_svg(file, chunks, bounds, resolution)
+
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from matplotlib.image import imsave
+
+    # Every chunk is drawn onto the canvas and dropped, so the figure never holds the whole tree
+    min_x, min_y, max_x, max_y = bounds
+    ratio = resolution / max(max_x - min_x, max_y - min_y, 1e-12)
+    dpi = 100
+    width, height = max(1, round((max_x - min_x) * ratio)), max(1, round((max_y - min_y) * ratio))
+    figure = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+    canvas = FigureCanvasAgg(figure)
+    ax = figure.add_axes((0, 0, 1, 1))
+    ax.set_axis_off()
+    ax.set_xlim(min_x, max_x)
+    ax.set_ylim(min_y, max_y)
+    canvas.draw()
+    count = 0
+    for chunk in chunks:
+        line = _plot_segments(ax, chunk, level)
+        ax.draw_artist(line)
+        line.remove()
+        count += len(chunk)
+    imsave(path, np.asarray(canvas.buffer_rgba()))
+    return count
+
+
 if __name__ == "__main__":
-    try:
-        level_input = input("Enter the recursion level: ")
-        level: int = int(level_input)
-        draw_tree(level)
-    except ValueError:
-        print("Please enter a valid integer for the recursion level.")
+    parser = argparse.ArgumentParser(description="Draw a fractal tree.")
+    parser.add_argument("level", type=int, help="The depth of recursion of the tree.")
+    parser.add_argument("--angle", type=float, default=45, help="Angle of the left and right turns, in degrees.")
+    parser.add_argument("--length", type=float, default=100, help="Length of the trunk.")
+    parser.add_argument("-o", "--output", help="Write the tree to a .png, .svg or .seg file instead of drawing it with turtle.")
+    parser.add_argument("--resolution", type=int, default=800, help="Size of the output in pixels.")
+    args = parser.parse_args()
+
+    if args.output:
+        count = export_tree(args.level, args.output, args.length, args.angle, args.resolution)
+        print(f"{count} segments written to {args.output}")
+    else:
+        draw_tree(args.level, args.length, args.angle)
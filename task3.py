@@ -1,14 +1,974 @@
 import heapq
-from typing import Dict, List, Tuple, Optional
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import accumulate
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Optional, Union
+
+
+class IndexedDaryHeap:
+    def __init__(self, size: int, arity: int = 4) -> None:
+        """Initialize an empty indexed d-ary min-heap of vertex ids.
+
+        Each vertex is in the heap at most once. Pushing a vertex that is
+        already queued lowers its key in place (decrease-key) instead of
+        adding a stale duplicate.
+
+        :param size: Number of vertices, i.e. the largest vertex id plus one.
+        :param arity: Number of children of each heap node.
+        """
+        self.arity = arity
+        self.heap: List[int] = []  # Vertex ids in heap order
+        self.keys = array("d", [float("infinity")]) * size
+        self.positions = array("q", [-1]) * size  # Index of each vertex in heap, -1 if absent
+
+    def __len__(self) -> int:
+        """Return the number of queued vertices."""
+        return len(self.heap)
+
+    def push(self, key: float, vertex: int) -> None:
+        """Queue a vertex, or lower its key if it is already queued.
+
+        :param key: The new key, not larger than the current one.
+        :param vertex: The vertex id.
+        """
+        position = self.positions[vertex]
+        if position < 0:
+            position = len(self.heap)
+            self.heap.append(vertex)
+        self.keys[vertex] = key
+        self._sift_up(position, vertex)
+
+    def pop(self) -> Tuple[float, int]:
+        """Remove the vertex with the smallest key.
+
+        :return: Tuple with the key and the vertex id.
+        """
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        self.positions[top] = -1
+        if heap:
+            self._sift_down(0, last)
+        return self.keys[top], top
+
+    def _sift_up(self, position: int, vertex: int) -> None:
+        """Move a vertex up from position until its parent's key is not larger."""
+        heap, keys, positions, arity = self.heap, self.keys, self.positions, self.arity
+        key = keys[vertex]
+        while position > 0:
+            parent = (position - 1) // arity
+            parent_vertex = heap[parent]
+            if keys[parent_vertex] <= key:
+                break
+            heap[position] = parent_vertex
+            positions[parent_vertex] = position
+            position = parent
+        heap[position] = vertex
+        positions[vertex] = position
+
+    def _sift_down(self, position: int, vertex: int) -> None:
+        """Move a vertex down from position until no child has a smaller key."""
+        heap, keys, positions, arity = self.heap, self.keys, self.positions, self.arity
+        key = keys[vertex]
+        size = len(heap)
+        while True:
+            first_child = arity * position + 1
+            if first_child >= size:
+                break
+            child = min(range(first_child, min(first_child + arity, size)), key=lambda i: keys[heap[i]])
+            child_vertex = heap[child]
+            if keys[child_vertex] >= key:
+                break
+            heap[position] = child_vertex
+            positions[child_vertex] = position
+            position = child
+        heap[position] = vertex
+        positions[vertex] = position
+
+
+class BucketQueue:
+    def __init__(self, max_weight: int) -> None:
+        """Initialize an empty bucket queue (Dial's algorithm) for integer keys.
+
+        Works for Dijkstra's algorithm with non-negative integer edge weights:
+        all queued keys then lie between the last popped key and that key plus
+        max_weight, so max_weight + 1 buckets used as a ring are enough.
+
+        :param max_weight: The largest edge weight.
+        """
+        self.buckets: List[List[Tuple[float, int]]] = [[] for _ in range(max_weight + 1)]
+        self.current = 0  # Key of the bucket popped from last
+        self.size = 0
+
+    def __len__(self) -> int:
+        """Return the number of queued entries."""
+        return self.size
+
+    def push(self, key: float, vertex: int) -> None:
+        """Queue a vertex with an integer key not smaller than the last popped one.
+
+        :param key: The key.
+        :param vertex: The vertex id.
+        """
+        self.buckets[int(key) % len(self.buckets)].append((key, vertex))
+        self.size += 1
+
+    def pop(self) -> Tuple[float, int]:
+        """Remove an entry with the smallest key.
+
+        :return: Tuple with the key and the vertex id.
+        """
+        buckets = self.buckets
+        while not buckets[self.current % len(buckets)]:
+            self.current += 1  # Scan forward to the next non-empty bucket
+        self.size -= 1
+        return buckets[self.current % len(buckets)].pop()
+
+
+class CSRGraph:
+    # File signature and header: signature, vertex count, edge count, integral flag
+    MAGIC = b"CSRGRAF1"
+    HEADER = struct.Struct("<8sqq?")
+
+    def __init__(
+        self, names: List[str], offsets: array, targets: array, weights: array, integral: Optional[bool] = None
+    ) -> None:
+        """Initialize a frozen graph in compressed sparse row (CSR) form.
+
+        Vertex names are interned to integer ids. The edges leaving vertex ``v``
+        are stored at positions ``offsets[v]`` to ``offsets[v + 1]`` of the flat
+        ``targets`` and ``weights`` arrays.
+
+        :param names: Vertex names, indexed by vertex id.
+        :param offsets: Start of each vertex's edges, with one extra final entry.
+        :param targets: Target vertex id of each edge.
+        :param weights: Weight of each edge.
+        :param integral: Whether all weights are integers, checked if not given.
+        """
+        self.names = names
+        # Integer weights give integer distances, like the dictionary-based search
+        self.integral = all(weight.is_integer() for weight in weights) if integral is None else integral
+        self.ids: Dict[str, int] = {name: vertex for vertex, name in enumerate(names)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    @classmethod
+    def from_edges(cls, edges: Dict[str, List[Tuple[str, int]]]) -> "CSRGraph":
+        """Build the CSR form from an adjacency dictionary like Graph.edges.
+
+        :param edges: Dictionary mapping vertices to lists of (neighbor, weight).
+        :return: The frozen graph.
+        """
+        names = list(edges)
+        ids = {name: vertex for vertex, name in enumerate(names)}
+        offsets = array("q", [0])
+        targets = array("q")
+        weights = array("d")
+        for name in names:
+            for neighbor, weight in edges[name]:
+                targets.append(ids[neighbor])
+                weights.append(weight)
+            offsets.append(len(targets))
+        return cls(names, offsets, targets, weights)
+
+    @classmethod
+    def from_edge_stream(cls, edges: Iterable[Tuple[str, str, float]]) -> "CSRGraph":
+        """Build the CSR form of an undirected graph straight from a stream of edges.
+
+        Edges are collected into compact arrays of vertex ids and then placed
+        into the CSR arrays by counting sort, without building the adjacency
+        dictionary. The result is the same as adding the edges to a Graph with
+        add_edge and freezing it.
+
+        :param edges: Iterable of (from_vertex, to_vertex, weight) tuples.
+        :return: The frozen graph.
+        """
+        names: List[str] = []
+        ids: Dict[str, int] = {}
+        sources, destinations, edge_weights = array("q"), array("q"), array("d")
+        integral = True
+        for from_vertex, to_vertex, weight in edges:
+            from_id = ids.get(from_vertex)
+            if from_id is None:
+                from_id = ids[from_vertex] = len(names)
+                names.append(from_vertex)
+            to_id = ids.get(to_vertex)
+            if to_id is None:
+                to_id = ids[to_vertex] = len(names)
+                names.append(to_vertex)
+            sources.append(from_id)
+            destinations.append(to_id)
+            edge_weights.append(weight)
+            if integral and type(weight) is not int:
+                integral = isinstance(weight, int)
+
+        # Each edge is stored in both directions, so it adds to both degrees
+        degrees = [0] * (len(names) + 1)
+        for vertex in sources:
+            degrees[vertex + 1] += 1
+        for vertex in destinations:
+            degrees[vertex + 1] += 1
+        offsets = array("q", accumulate(degrees))
+
+        # Fill every vertex's slots in edge order, like repeated add_edge calls
+        cursor = offsets.tolist()
+        targets = array("q", [0]) * offsets[-1]
+        weights = array("d", [0.0]) * offsets[-1]
+        for from_id, to_id, weight in zip(sources, destinations, edge_weights):
+            position = cursor[from_id]
+            targets[position] = to_id
+            weights[position] = weight
+            cursor[from_id] = position + 1
+            position = cursor[to_id]
+            targets[position] = from_id
+            weights[position] = weight
+            cursor[to_id] = position + 1
+        return cls(names, offsets, targets, weights, integral)
+
+    def save(self, path: str) -> None:
+        """Save the graph to a compact binary file.
+
+        :param path: Path of the file to write.
+        """
+        with open(path, "wb") as file:
+            file.write(self.HEADER.pack(self.MAGIC, len(self.names), len(self.targets), self.integral))
+            _write_names(file, self.names)
+            _write_array(file, self.offsets)
+            _write_array(file, self.targets)
+            _write_array(file, self.weights)
+
+    @classmethod
+    def load(cls, path: str) -> "CSRGraph":
+        """Load a graph saved with save, without parsing any text.
+
+        :param path: Path of the file to read.
+        :return: The frozen graph.
+        """
+        with open(path, "rb") as file:
+            magic, n, m, integral = cls.HEADER.unpack(file.read(cls.HEADER.size))
+            if magic != cls.MAGIC:
+                raise ValueError(f"{path} is not a graph file.")
+            names = _read_names(file, n)
+            offsets = _read_array(file, "q", n + 1)
+            targets = _read_array(file, "q", m)
+            weights = _read_array(file, "d", m)
+        return cls(names, offsets, targets, weights, integral)
+
+    def __len__(self) -> int:
+        """Return the number of vertices."""
+        return len(self.names)
+
+    def dijkstra_ids(
+        self, start: int, queue: str = "heapq", arity: int = 4, stats: Optional[Dict[str, int]] = None
+    ) -> Tuple[array, array]:
+        """Run Dijkstra's algorithm on vertex ids.
+
+        :param start: The id of the starting vertex.
+        :param queue: Priority queue backend:
+                      - "heapq": binary heap with lazy insertion, stale entries are skipped.
+                      - "dary": indexed d-ary heap with decrease-key, see IndexedDaryHeap.
+                      - "buckets": bucket queue for non-negative integer weights, see BucketQueue.
+        :param arity: Number of children per node of the "dary" heap.
+        :param stats: Dictionary to fill with the number of queue "pushes", "pops"
+                      and "stale" entries skipped.
+        :return: A tuple of two flat arrays indexed by vertex id:
+                 - distances: shortest distance from start, infinity if unreachable.
+                 - previous: id of the previous vertex in the shortest path, -1 if none.
+        """
+        if queue != "heapq":
+            return self._dijkstra_queue(start, queue, arity, stats)
+
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        distances = array("d", [float("infinity")]) * len(self.names)
+        previous = array("q", [-1]) * len(self.names)
+        distances[start] = 0
+        pushes, pops, stale = 1, 0, 0
+
+        # Priority queue of (distance from start, vertex id)
+        heap: List[Tuple[float, int]] = [(0, start)]
+
+        while heap:
+            current_distance, current_vertex = heapq.heappop(heap)
+            pops += 1
+
+            # Skip if we already found a better path
+            if current_distance > distances[current_vertex]:
+                stale += 1
+                continue
+
+            for edge in range(offsets[current_vertex], offsets[current_vertex + 1]):
+                neighbor = targets[edge]
+                distance = current_distance + weights[edge]
+
+                if distance < distances[neighbor]:
+                    distances[neighbor] = distance
+                    previous[neighbor] = current_vertex
+                    heapq.heappush(heap, (distance, neighbor))
+                    pushes += 1
+
+        if stats is not None:
+            stats.update(pushes=pushes, pops=pops, stale=stale)
+        return distances, previous
+
+    def _dijkstra_queue(
+        self, start: int, queue: str, arity: int, stats: Optional[Dict[str, int]]
+    ) -> Tuple[array, array]:
+        """Run Dijkstra's algorithm with an IndexedDaryHeap or BucketQueue, see dijkstra_ids."""
+        if queue == "dary":
+            frontier = IndexedDaryHeap(len(self.names), arity)
+        elif queue == "buckets":
+            if not self.integral or any(weight < 0 for weight in self.weights):
+                raise ValueError("The bucket queue needs non-negative integer weights.")
+            frontier = BucketQueue(int(max(self.weights, default=0)))
+        else:
+            raise ValueError(f"Unknown priority queue: {queue}")
+
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        distances = array("d", [float("infinity")]) * len(self.names)
+        previous = array("q", [-1]) * len(self.names)
+        distances[start] = 0
+        frontier.push(0, start)
+        pushes, pops, stale = 1, 0, 0
+
+        while frontier:
+            current_distance, current_vertex = frontier.pop()
+            pops += 1
+
+            # Only the bucket queue keeps stale entries
+            if current_distance > distances[current_vertex]:
+                stale += 1
+                continue
+
+            for edge in range(offsets[current_vertex], offsets[current_vertex + 1]):
+                neighbor = targets[edge]
+                distance = current_distance + weights[edge]
+
+                if distance < distances[neighbor]:
+                    distances[neighbor] = distance
+                    previous[neighbor] = current_vertex
+                    frontier.push(distance, neighbor)
+                    pushes += 1
+
+        if stats is not None:
+            stats.update(pushes=pushes, pops=pops, stale=stale)
+        return distances, previous
+
+    def dijkstra(
+        self, start: str, queue: str = "heapq", arity: int = 4, stats: Optional[Dict[str, int]] = None
+    ) -> Tuple[Dict[str, float], Dict[str, Optional[str]]]:
+        """Run Dijkstra's algorithm and map the result back to vertex names.
+
+        :param start: The starting vertex.
+        :param queue: Priority queue backend, see dijkstra_ids.
+        :param arity: Number of children per node of the "dary" heap.
+        :param stats: Dictionary to fill with queue statistics, see dijkstra_ids.
+        :return: A tuple of two dictionaries, as returned by Graph.dijkstra.
+        """
+        distances, previous = self.dijkstra_ids(self.ids[start], queue, arity, stats)
+        names = self.names
+        return (
+            self.named_distances(distances),
+            {name: names[prev] if prev >= 0 else None for name, prev in zip(names, previous)},
+        )
+
+    def named_distances(self, distances: array) -> Dict[str, float]:
+        """Map a flat distance array back to vertex names.
+
+        :param distances: Distances indexed by vertex id.
+        :return: Dictionary mapping vertex names to distances.
+        """
+        if self.integral:
+            distances = [int(d) if d != float("infinity") else d for d in distances]
+        return dict(zip(self.names, distances))
+
+    def shortest_path_ids(
+        self, source: int, target: int, heuristic: Optional[Callable[[int], float]] = None
+    ) -> Tuple[float, List[int], int]:
+        """Find the shortest path between two vertex ids, stopping once the target is settled.
+
+        Without a heuristic this is Dijkstra's algorithm with an early exit.
+        With one it is A*: vertices are explored in order of distance plus the
+        heuristic's estimate of the remaining distance to the target. The
+        heuristic must be admissible, i.e. never overestimate that distance.
+
+        :param source: The id of the starting vertex.
+        :param target: The id of the target vertex.
+        :param heuristic: Function estimating the distance from a vertex id to the target.
+        :return: A tuple (distance, path of vertex ids, number of settled vertices).
+                 The distance is infinity and the path empty if target is unreachable.
+        """
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        distances = array("d", [float("infinity")]) * len(self.names)
+        previous = array("q", [-1]) * len(self.names)
+        distances[source] = 0
+        settled = 0
+
+        # Priority queue of (estimated total distance, distance from source, vertex id)
+        heap: List[Tuple[float, float, int]] = [(heuristic(source) if heuristic else 0, 0, source)]
+
+        while heap:
+            _, current_distance, current_vertex = heapq.heappop(heap)
+
+            # Skip if we already found a better path
+            if current_distance > distances[current_vertex]:
+                continue
+            settled += 1
+            if current_vertex == target:
+                return current_distance, _path_ids(previous, target), settled
+
+            for edge in range(offsets[current_vertex], offsets[current_vertex + 1]):
+                neighbor = targets[edge]
+                distance = current_distance + weights[edge]
+
+                if distance < distances[neighbor]:
+                    distances[neighbor] = distance
+                    previous[neighbor] = current_vertex
+                    estimate = distance + heuristic(neighbor) if heuristic else distance
+                    heapq.heappush(heap, (estimate, distance, neighbor))
+
+        return float("infinity"), [], settled
+
+    def bidirectional_ids(self, source: int, target: int) -> Tuple[float, List[int], int]:
+        """Find the shortest path between two vertex ids with bidirectional Dijkstra.
+
+        One search grows from the source and one from the target, always
+        advancing the one with the smaller frontier distance, until the sum of
+        both frontier distances reaches the best path found so far. The graph
+        must be undirected, as every graph built by Graph is.
+
+        :param source: The id of the starting vertex.
+        :param target: The id of the target vertex.
+        :return: A tuple (distance, path of vertex ids, number of settled vertices).
+                 The distance is infinity and the path empty if target is unreachable.
+        """
+        if source == target:
+            return 0, [source], 1
+
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        # Index 0 holds the forward search from source, index 1 the backward one from target
+        n = len(self.names)
+        distances = (array("d", [float("infinity")]) * n, array("d", [float("infinity")]) * n)
+        previous = (array("q", [-1]) * n, array("q", [-1]) * n)
+        heaps: Tuple[List[Tuple[float, int]], List[Tuple[float, int]]] = ([(0, source)], [(0, target)])
+        distances[0][source] = 0
+        distances[1][target] = 0
+
+        best = float("infinity")  # Length of the shortest path found so far
+        meeting = -1  # Vertex where the two searches meet on that path
+        settled = 0
+
+        while heaps[0] and heaps[1]:
+            # Stop once no path through the frontiers can be shorter than the best one
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            current_distance, current_vertex = heapq.heappop(heaps[side])
+            if current_distance > distances[side][current_vertex]:
+                continue
+            settled += 1
+
+            side_distances, side_previous = distances[side], previous[side]
+            other_distances = distances[1 - side]
+            for edge in range(offsets[current_vertex], offsets[current_vertex + 1]):
+                neighbor = targets[edge]
+                distance = current_distance + weights[edge]
+
+                if distance < side_distances[neighbor]:
+                    side_distances[neighbor] = distance
+                    side_previous[neighbor] = current_vertex
+                    heapq.heappush(heaps[side], (distance, neighbor))
+                # Check whether the edge joins the two searches on a shorter path
+                if distance + other_distances[neighbor] < best:
+                    best = distance + other_distances[neighbor]
+                    meeting = neighbor
+
+        if meeting < 0:
+            return float("infinity"), [], settled
+
+        # Forward half up to the meeting vertex, then the backward half to target
+        path = _path_ids(previous[0], meeting)
+        vertex = previous[1][meeting]
+        while vertex >= 0:
+            path.append(vertex)
+            vertex = previous[1][vertex]
+        return best, path, settled
+
+
+def _path_ids(previous: array, target: int) -> List[int]:
+    """Reconstruct the path to target from a flat predecessor array.
+
+    :param previous: Id of the previous vertex of each vertex, -1 if none.
+    :param target: The id of the last vertex of the path.
+    :return: List of vertex ids from the start of the search to target.
+    """
+    path = []
+    vertex = target
+    while vertex >= 0:
+        path.append(vertex)
+        vertex = previous[vertex]
+    path.reverse()
+    return path
+
+
+def euclidean_heuristic(coordinates: Dict[str, Tuple[float, float]]) -> Callable[[str, str], float]:
+    """Build an A* heuristic from vertex coordinates.
+
+    The straight-line distance is admissible when no edge is shorter than
+    the distance between its endpoints, as on road maps.
+
+    :param coordinates: Dictionary mapping vertices to (x, y) positions.
+    :return: Function returning the straight-line distance between two vertices.
+    """
+
+    def heuristic(vertex: str, target: str) -> float:
+        (x1, y1), (x2, y2) = coordinates[vertex], coordinates[target]
+        return math.hypot(x1 - x2, y1 - y2)
+
+    return heuristic
+
+
+def _write_array(file, values: array) -> None:
+    """Write an array to a binary file in little-endian byte order."""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    values.tofile(file)
+
+
+def _read_array(file, typecode: str, count: int) -> array:
+    """Read an array written by _write_array from a binary file."""
+    values = array(typecode)
+    values.fromfile(file, count)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _write_names(file, names: List[str]) -> None:
+    """Write vertex names to a binary file as their lengths followed by the UTF-8 text."""
+    encoded = [name.encode("utf-8") for name in names]
+    _write_array(file, array("q", [len(name) for name in encoded]))
+    file.write(b"".join(encoded))
+
+
+def _read_names(file, count: int) -> List[str]:
+    """Read vertex names written by _write_names from a binary file."""
+    lengths = _read_array(file, "q", count)
+    blob = file.read(sum(lengths))
+    names = []
+    position = 0
+    for length in lengths:
+        names.append(blob[position : position + length].decode("utf-8"))
+        position += length
+    return names
+
+
+def _parse_weight(text: str) -> Union[int, float]:
+    """Parse an edge weight, keeping integer weights as int."""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def read_edge_list(path: str, chunk_size: int = 1 << 20) -> Iterator[Tuple[str, str, Union[int, float]]]:
+    """Stream the edges of a text edge-list file.
+
+    Each line holds ``from_vertex to_vertex weight`` separated by whitespace.
+    Empty lines and lines starting with ``#`` are skipped. The file is read in
+    chunks of about chunk_size bytes, so memory does not grow with its size.
+
+    :param path: Path of the file to read.
+    :param chunk_size: Approximate number of bytes read at once.
+    :return: Iterator over (from_vertex, to_vertex, weight) tuples.
+    """
+    with open(path, encoding="utf-8") as file:
+        while True:
+            lines = file.readlines(chunk_size)
+            if not lines:
+                break
+            for line in lines:
+                fields = line.split()
+                if not fields or fields[0].startswith("#"):
+                    continue
+                from_vertex, to_vertex, weight = fields
+                yield from_vertex, to_vertex, _parse_weight(weight)
+
+
+# Record of a binary edge-list file: two integer vertex ids and a float weight
+EDGE_RECORD = struct.Struct("<qqd")
+
+
+def read_binary_edge_list(path: str, chunk_size: int = 1 << 20) -> Iterator[Tuple[str, str, Union[int, float]]]:
+    """Stream the edges of a binary edge-list file of EDGE_RECORD records.
+
+    The file is memory-mapped and unpacked chunk by chunk. Integer vertex ids
+    become vertex names like ``"42"``, and whole-number weights become int.
+
+    :param path: Path of the file to read.
+    :param chunk_size: Approximate number of bytes unpacked at once.
+    :return: Iterator over (from_vertex, to_vertex, weight) tuples.
+    """
+    # Whole records only, and at least one of them per chunk
+    chunk_size = max(chunk_size - chunk_size % EDGE_RECORD.size, EDGE_RECORD.size)
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for start in range(0, len(data), chunk_size):
+                for from_id, to_id, weight in EDGE_RECORD.iter_unpack(data[start : start + chunk_size]):
+                    yield str(from_id), str(to_id), int(weight) if weight.is_integer() else weight
+
+
+class ContractionHierarchy:
+    # File signature and header: signature, vertex count, upward edge count, integral flag
+    MAGIC = b"CHGRAPH1"
+    HEADER = struct.Struct("<8sqq?")
+
+    def __init__(self, names: List[str], offsets: array, targets: array, weights: array, integral: bool) -> None:
+        """Initialize a contraction hierarchy from its upward graph.
+
+        Every vertex has a rank given by the order of contraction. The upward
+        graph holds, in CSR form, the original and shortcut edges leading from
+        each vertex to vertices of higher rank. Any shortest path can be found
+        as an upward path from the source joined with an upward path from the
+        target, so queries search only this small part of the graph.
+
+        :param names: Vertex names, indexed by vertex id.
+        :param offsets: Start of each vertex's upward edges, with one extra final entry.
+        :param targets: Target vertex id of each upward edge.
+        :param weights: Weight of each upward edge.
+        :param integral: Whether distances should be reported as integers.
+        """
+        self.names = names
+        self.ids: Dict[str, int] = {name: vertex for vertex, name in enumerate(names)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.integral = integral
+
+    @classmethod
+    def build(cls, graph: CSRGraph, max_settled: int = 500) -> "ContractionHierarchy":
+        """Contract the vertices of an undirected graph one by one.
+
+        Vertices are picked by lazily updated priority: the number of
+        shortcuts contracting them would add, minus their degree, plus the
+        number of their already contracted neighbours. A shortcut between two
+        neighbours is added unless a witness search finds a path between them
+        that avoids the contracted vertex and is no longer.
+
+        :param graph: The frozen undirected graph.
+        :param max_settled: Limit of vertices settled by one witness search.
+                            Stopping early only adds unneeded shortcuts.
+        :return: The contraction hierarchy.
+        """
+        n = len(graph)
+        # Working graph of not yet contracted vertices: neighbour -> lightest edge weight
+        adjacency: List[Dict[int, float]] = [{} for _ in range(n)]
+        for vertex in range(n):
+            neighbors = adjacency[vertex]
+            for edge in range(graph.offsets[vertex], graph.offsets[vertex + 1]):
+                neighbor, weight = graph.targets[edge], graph.weights[edge]
+                if neighbor != vertex and weight < neighbors.get(neighbor, float("infinity")):
+                    neighbors[neighbor] = weight
+
+        contracted_neighbors = [0] * n
+        level = [0] * n  # Depth of the hierarchy below each vertex
+        upward: List[List[Tuple[int, float]]] = [[] for _ in range(n)]
+
+        def priority(vertex: int) -> int:
+            shortcuts = cls._shortcuts(adjacency, vertex, max_settled)
+            return 2 * (len(shortcuts) - len(adjacency[vertex])) + contracted_neighbors[vertex] + level[vertex]
+
+        heap = [(priority(vertex), vertex) for vertex in range(n)]
+        heapq.heapify(heap)
+
+        while heap:
+            _, vertex = heapq.heappop(heap)
+            # Lazy update: contract only if the vertex is still the best choice
+            current_priority = priority(vertex)
+            if heap and current_priority > heap[0][0]:
+                heapq.heappush(heap, (current_priority, vertex))
+                continue
+
+            for u, x, weight in cls._shortcuts(adjacency, vertex, max_settled):
+                if weight < adjacency[u].get(x, float("infinity")):
+                    adjacency[u][x] = weight
+                    adjacency[x][u] = weight
+            # All remaining neighbours get contracted later, so their edges lead upward
+            for neighbor, weight in adjacency[vertex].items():
+                upward[vertex].append((neighbor, weight))
+                del adjacency[neighbor][vertex]
+                contracted_neighbors[neighbor] += 1
+                level[neighbor] = max(level[neighbor], level[vertex] + 1)
+            adjacency[vertex] = {}
+
+        offsets = array("q", [0])
+        targets = array("q")
+        weights = array("d")
+        for edges in upward:
+            for neighbor, weight in edges:
+                targets.append(neighbor)
+                weights.append(weight)
+            offsets.append(len(targets))
+        return cls(list(graph.names), offsets, targets, weights, graph.integral)
+
+    @staticmethod
+    def _shortcuts(
+        adjacency: List[Dict[int, float]], vertex: int, max_settled: int
+    ) -> List[Tuple[int, int, float]]:
+        """Find the shortcuts needed to contract a vertex.
+
+        :param adjacency: Working graph of not yet contracted vertices.
+        :param vertex: The vertex to contract.
+        :param max_settled: Limit of vertices settled by one witness search.
+        :return: List of shortcuts (u, x, weight) between neighbours of the vertex.
+        """
+        shortcuts = []
+        neighbors = list(adjacency[vertex].items())
+        for i, (u, weight_u) in enumerate(neighbors[:-1]):
+            rest = neighbors[i + 1 :]
+            limit = weight_u + max(weight for _, weight in rest)
+
+            # Witness search: Dijkstra from u that avoids the contracted vertex,
+            # until all other neighbours are settled or out of reach
+            distances = {u: 0}
+            heap: List[Tuple[float, int]] = [(0, u)]
+            remaining = {x for x, _ in rest}
+            settled = 0
+            while heap and remaining and settled < max_settled:
+                current_distance, current_vertex = heapq.heappop(heap)
+                if current_distance > distances[current_vertex]:
+                    continue
+                if current_distance > limit:
+                    break
+                settled += 1
+                remaining.discard(current_vertex)
+                for neighbor, weight in adjacency[current_vertex].items():
+                    distance = current_distance + weight
+                    if neighbor != vertex and distance < distances.get(neighbor, float("infinity")):
+                        distances[neighbor] = distance
+                        heapq.heappush(heap, (distance, neighbor))
+
+            for x, weight_x in rest:
+                via_vertex = weight_u + weight_x
+                if distances.get(x, float("infinity")) > via_vertex:
+                    shortcuts.append((u, x, via_vertex))
+        return shortcuts
+
+    def distance_ids(self, source: int, target: int) -> float:
+        """Compute the shortest distance between two vertex ids.
+
+        Runs Dijkstra upward from both ends at once. Each side stops once its
+        frontier is no closer than the best meeting point found.
+
+        :param source: The id of the starting vertex.
+        :param target: The id of the target vertex.
+        :return: The shortest distance, infinity if target is unreachable.
+        """
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        distances: Tuple[Dict[int, float], Dict[int, float]] = ({source: 0}, {target: 0})
+        heaps: Tuple[List[Tuple[float, int]], List[Tuple[float, int]]] = ([(0, source)], [(0, target)])
+        best = 0 if source == target else float("infinity")
+        side = 0
+
+        while True:
+            # Alternate between the sides, dropping a side once its frontier is not closer than best
+            if not heaps[side] or heaps[side][0][0] >= best:
+                side = 1 - side
+                if not heaps[side] or heaps[side][0][0] >= best:
+                    return best
+            heap, side_distances, other_distances = heaps[side], distances[side], distances[1 - side]
+            current_distance, current_vertex = heapq.heappop(heap)
+            if current_distance > side_distances[current_vertex]:
+                continue
+
+            if current_vertex in other_distances:
+                best = min(best, current_distance + other_distances[current_vertex])
+            start, end = offsets[current_vertex], offsets[current_vertex + 1]
+            edges = list(zip(targets[start:end], weights[start:end]))
+
+            # Stall on demand: skip the vertex if a higher vertex reaches it more cheaply,
+            # since then no shortest path from this side goes upward through it
+            infinity = float("infinity")
+            if any(side_distances.get(neighbor, infinity) + weight < current_distance for neighbor, weight in edges):
+                side = 1 - side
+                continue
+
+            for neighbor, weight in edges:
+                distance = current_distance + weight
+                if distance < side_distances.get(neighbor, float("infinity")):
+                    side_distances[neighbor] = distance
+                    heapq.heappush(heap, (distance, neighbor))
+            side = 1 - side
+
+    def distance(self, source: str, target: str) -> float:
+        """Compute the shortest distance between two vertices.
+
+        Matches Graph.dijkstra exactly for integer weights. Float weights may
+        differ in the last bits, because shortcuts add weights in another order.
+
+        :param source: The starting vertex.
+        :param target: The target vertex.
+        :return: The shortest distance, infinity if target is unreachable.
+        """
+        distance = self.distance_ids(self.ids[source], self.ids[target])
+        if self.integral and distance != float("infinity"):
+            distance = int(distance)
+        return distance
+
+    def index_size(self) -> int:
+        """Return the size of the upward graph arrays in bytes."""
+        return sum(len(values) * values.itemsize for values in (self.offsets, self.targets, self.weights))
+
+    def save(self, path: str) -> None:
+        """Save the contraction hierarchy to a binary file.
+
+        :param path: Path of the file to write.
+        """
+        with open(path, "wb") as file:
+            file.write(self.HEADER.pack(self.MAGIC, len(self.names), len(self.targets), self.integral))
+            _write_names(file, self.names)
+            _write_array(file, self.offsets)
+            _write_array(file, self.targets)
+            _write_array(file, self.weights)
+
+    @classmethod
+    def load(cls, path: str) -> "ContractionHierarchy":
+        """Load a contraction hierarchy saved with save.
+
+        :param path: Path of the file to read.
+        :return: The contraction hierarchy.
+        """
+        with open(path, "rb") as file:
+            magic, n, m, integral = cls.HEADER.unpack(file.read(cls.HEADER.size))
+            if magic != cls.MAGIC:
+                raise ValueError(f"{path} is not a contraction hierarchy file.")
+            names = _read_names(file, n)
+            offsets = _read_array(file, "q", n + 1)
+            targets = _read_array(file, "q", m)
+            weights = _read_array(file, "d", m)
+        return cls(names, offsets, targets, weights, integral)
+
+
+# Graph loaded once into each worker process by the pool initializer
+_worker_graph: Optional[CSRGraph] = None
+_worker_matrix: Optional[mmap.mmap] = None
+
+
+def _init_worker(graph: CSRGraph, matrix_path: Optional[str] = None) -> None:
+    """Keep the graph, and optionally the open distance matrix, in a worker process.
+
+    :param graph: The frozen graph, pickled once per worker.
+    :param matrix_path: Path of the distance matrix file the worker writes rows into.
+    """
+    global _worker_graph, _worker_matrix
+    _worker_graph = graph
+    if matrix_path is not None:
+        with open(matrix_path, "r+b") as file:
+            _worker_matrix = mmap.mmap(file.fileno(), 0)
+
+
+def _worker_distances(source: int) -> Tuple[int, bytes]:
+    """Run Dijkstra's algorithm from one source in a worker process.
+
+    :param source: The id of the starting vertex.
+    :return: Tuple with the source id and the raw bytes of the distance array.
+    """
+    distances, _ = _worker_graph.dijkstra_ids(source)
+    return source, distances.tobytes()
+
+
+def _write_matrix_row(matrix: mmap.mmap, graph: CSRGraph, row: int, source: int) -> int:
+    """Run Dijkstra's algorithm from one source and write the row of the distance matrix.
+
+    :param matrix: The memory-mapped distance matrix.
+    :param graph: The frozen graph.
+    :param row: The row of the matrix to write.
+    :param source: The id of the starting vertex.
+    :return: The written row.
+    """
+    distances, _ = graph.dijkstra_ids(source)
+    row_size = len(distances) * distances.itemsize
+    matrix[row * row_size : (row + 1) * row_size] = distances.tobytes()
+    return row
+
+
+def _worker_matrix_row(row: int, source: int) -> int:
+    """Write one row of the distance matrix in a worker process."""
+    return _write_matrix_row(_worker_matrix, _worker_graph, row, source)
+
+
+def _bounded_map(executor: ProcessPoolExecutor, func: Callable, tasks: Iterable[tuple], window: int) -> Iterator:
+    """Run tasks on an executor keeping at most window of them in flight.
+
+    :param executor: The process pool.
+    :param func: Function to run for each task.
+    :param tasks: Argument tuples, one per task.
+    :param window: Maximum number of submitted but not yet consumed tasks.
+    :return: Iterator over the results in order of completion.
+    """
+    pending = set()
+    for task in tasks:
+        pending.add(executor.submit(func, *task))
+        if len(pending) >= window:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
 
 
 class Graph:
-    def __init__(self) -> None:
+    def __init__(self, cache_size: int = 0) -> None:
         """Initialize an empty graph.
         The graph is represented as a dictionary where keys are vertices and values
         are lists of tuples representing edges in the form (neighbor, weight).
+
+        :param cache_size: Number of shortest-path trees kept by dijkstra, 0 disables the cache.
+                           Every cached tree holds two dictionaries with an entry per
+                           vertex, and every cache hit copies both of them.
         """
-        self.edges: Dict[str, List[Tuple[str, int]]] = {}
+        # Adjacency dictionary, None while a loaded graph lives only in its frozen form
+        self._edges: Optional[Dict[str, List[Tuple[str, int]]]] = {}
+        self._csr: Optional[CSRGraph] = None  # Frozen form, rebuilt after changes
+        self._zero_weights = False  # Whether any edge weighs 0, which rules out tree repairs
+        self.coordinates: Dict[str, Tuple[float, float]] = {}  # Optional (x, y) of vertices
+        self.cache_size = cache_size
+        # LRU cache: source -> (distances, previous, edges added since the tree was computed)
+        self._trees: OrderedDict[str, Tuple[Dict[str, float], Dict[str, Optional[str]], List[Tuple[str, str, int]]]]
+        self._trees = OrderedDict()
+        self.cache_stats = {"hits": 0, "misses": 0, "repairs": 0}
+
+    @property
+    def edges(self) -> Dict[str, List[Tuple[str, int]]]:
+        """The adjacency dictionary, mapping vertices to lists of (neighbor, weight).
+
+        A graph loaded with from_csr, load or load_edge_list answers queries from
+        its frozen form. The dictionary is built from that form on first access,
+        e.g. by the first add_edge.
+        """
+        if self._edges is None:
+            csr = self._csr
+            names, offsets, targets, weights = csr.names, csr.offsets, csr.targets, csr.weights
+            cast = int if csr.integral else float
+            edges = {}
+            for vertex, name in enumerate(names):
+                start, end = offsets[vertex], offsets[vertex + 1]
+                neighbors = zip(targets[start:end], weights[start:end])
+                edges[name] = [(names[target], cast(weight)) for target, weight in neighbors]
+            self._edges = edges
+            self._zero_weights = any(weight <= 0 for weight in weights)
+        return self._edges
 
     def add_edge(self, from_vertex: str, to_vertex: str, weight: int) -> None:
         """Add edge to the graph.
@@ -19,52 +979,317 @@ class Graph:
         :param to_vertex: The ending vertex.
         :param weight: The weight of the edge.
         """
+        edges = self.edges
         # If the vertex is not in the graph, add it with an empty list.
-        if from_vertex not in self.edges:
-            self.edges[from_vertex] = []
-        if to_vertex not in self.edges:
-            self.edges[to_vertex] = []
+        if from_vertex not in edges:
+            edges[from_vertex] = []
+        if to_vertex not in edges:
+            edges[to_vertex] = []
         # Add the edge in both directions.
-        self.edges[from_vertex].append((to_vertex, weight))
-        self.edges[to_vertex].append((from_vertex, weight))
+        edges[from_vertex].append((to_vertex, weight))
+        edges[to_vertex].append((from_vertex, weight))
+        self._csr = None  # The frozen form is out of date now
+        self._zero_weights = self._zero_weights or weight <= 0
+        # Cached trees are repaired with the new edge on their next use
+        for _, _, pending in self._trees.values():
+            pending.append((from_vertex, to_vertex, weight))
+
+    @classmethod
+    def from_csr(cls, csr: CSRGraph, cache_size: int = 0) -> "Graph":
+        """Wrap a frozen graph, which stays the form used for searches.
+
+        The adjacency dictionary is not built until edges is first accessed,
+        so wrapping takes constant time.
+
+        :param csr: The frozen graph.
+        :param cache_size: Number of shortest-path trees kept by dijkstra.
+        :return: The graph.
+        """
+        graph = cls(cache_size)
+        graph._edges = None
+        graph._csr = csr
+        return graph
+
+    @classmethod
+    def load_edge_list(cls, path: str, binary: bool = False, chunk_size: int = 1 << 20) -> "Graph":
+        """Load a graph from a large edge-list file.
+
+        The file is streamed in chunks straight into the frozen form, see
+        read_edge_list and read_binary_edge_list for the formats.
 
-    def dijkstra(self, start: str) -> Tuple[Dict[str, float], Dict[str, Optional[str]]]:
+        :param path: Path of the edge-list file.
+        :param binary: Whether the file holds binary EDGE_RECORD records instead of text.
+        :param chunk_size: Approximate number of bytes read at once.
+        :return: The graph.
+        """
+        reader = read_binary_edge_list if binary else read_edge_list
+        return cls.from_csr(CSRGraph.from_edge_stream(reader(path, chunk_size)))
+
+    def save(self, path: str) -> None:
+        """Save the graph to a compact binary file that load reopens without parsing.
+
+        :param path: Path of the file to write.
+        """
+        self.freeze().save(path)
+
+    @classmethod
+    def load(cls, path: str) -> "Graph":
+        """Load a graph saved with save.
+
+        :param path: Path of the file to read.
+        :return: The graph.
+        """
+        return cls.from_csr(CSRGraph.load(path))
+
+    def freeze(self) -> CSRGraph:
+        """Return the compressed sparse row form of the graph.
+
+        The frozen form is built once and reused until the next add_edge call.
+
+        :return: The frozen graph.
+        """
+        if self._csr is None:
+            self._csr = CSRGraph.from_edges(self._edges)
+        return self._csr
+
+    def dijkstra(
+        self, start: str, queue: str = "heapq", arity: int = 4, stats: Optional[Dict[str, int]] = None
+    ) -> Tuple[Dict[str, float], Dict[str, Optional[str]]]:
         """Compute the shortest distances from the start node to every other node
         using Dijkstra's algorithm.
 
         :param start: The starting vertex.
+        :param queue: Priority queue backend: "heapq", "dary" or "buckets",
+                      see CSRGraph.dijkstra_ids.
+        :param arity: Number of children per node of the "dary" heap.
+        :param stats: Dictionary to fill with the number of queue "pushes", "pops"
+                      and "stale" entries skipped.
         :return: A tuple of two dictionaries:
                  - distances: shortest distance from start to each vertex.
                  - previous: the previous vertex in the shortest path.
         """
-        # Initialize distances: set all to infinity except the start vertex.
-        distances = {vertex: float("infinity") for vertex in self.edges}
-        previous = {vertex: None for vertex in self.edges}
-        distances[start] = 0
+        # Only the "heapq" search breaks ties in an order the repair can reproduce,
+        # and measuring a queue backend needs a real run, so both bypass the cache.
+        if not self.cache_size or queue != "heapq" or stats is not None:
+            # Run on the frozen integer form and map the result back to names.
+            return self.freeze().dijkstra(start, queue, arity, stats)
+
+        if start in self._trees and not (self._trees[start][2] and self._zero_weights):
+            self._trees.move_to_end(start)
+            distances, previous, pending = self._trees[start]
+            if pending:
+                self._repair_tree(distances, previous, pending)
+                pending.clear()
+                self.cache_stats["repairs"] += 1
+            else:
+                self.cache_stats["hits"] += 1
+        else:
+            self.cache_stats["misses"] += 1
+            distances, previous = self.freeze().dijkstra(start, queue, arity)
+            self._trees[start] = (distances, previous, [])
+            if len(self._trees) > self.cache_size:
+                self._trees.popitem(last=False)  # Drop the least recently used tree
+
+        # Hand out copies, so callers cannot change the cached tree
+        return dict(distances), dict(previous)
+
+    def _repair_tree(
+        self,
+        distances: Dict[str, float],
+        previous: Dict[str, Optional[str]],
+        new_edges: List[Tuple[str, str, int]],
+    ) -> None:
+        """Update a cached shortest-path tree in place after edges were added.
+
+        Adding an edge with a non-negative weight can only shorten paths.
+        Dijkstra's algorithm is rerun only from the endpoints whose distance the
+        new edges lower, and it spreads only into the part of the tree that
+        gets shorter.
 
-        # Priority queue to hold vertices to explore.
-        # Each element is a tuple (distance from start, vertex)
-        heap: List[Tuple[float, str]] = [(0, start)]
+        The previous vertices match a full rerun as well. With positive weights
+        the "heapq" search settles vertices in order of (distance, vertex id)
+        and keeps the first settled neighbor on a shortest path, so every
+        vertex that got shorter or gained an equally short neighbor picks that
+        neighbor again. The caller recomputes trees of graphs with zero weights.
+
+        :param distances: Cached shortest distances, updated in place.
+        :param previous: Cached previous vertices, updated in place.
+        :param new_edges: Edges (from_vertex, to_vertex, weight) added since the tree was computed.
+        """
+        infinity = float("infinity")
+        heap: List[Tuple[float, str]] = []
+        touched = set()  # Vertices whose previous vertex may have changed
+        for from_vertex, to_vertex, weight in new_edges:
+            # Vertices added by the new edges start out unreachable
+            for vertex in (from_vertex, to_vertex):
+                if vertex not in distances:
+                    distances[vertex] = infinity
+                    previous[vertex] = None
+            for vertex, neighbor in ((from_vertex, to_vertex), (to_vertex, from_vertex)):
+                distance = distances[vertex] + weight
+                if distance < distances[neighbor]:
+                    distances[neighbor] = distance
+                    heapq.heappush(heap, (distance, neighbor))
+                if distance == distances[neighbor] != infinity:
+                    touched.add(neighbor)
 
         while heap:
-            # Get the vertex with the smallest distance
             current_distance, current_vertex = heapq.heappop(heap)
 
             # Skip if we already found a better path
             if current_distance > distances[current_vertex]:
                 continue
 
-            # Check all the neighbors of the current vertex.
             for neighbor, weight in self.edges[current_vertex]:
                 distance = current_distance + weight
-
-                # If a shorter path to neighbor is found, update its distance and previous vertex.
                 if distance < distances[neighbor]:
                     distances[neighbor] = distance
-                    previous[neighbor] = current_vertex
                     heapq.heappush(heap, (distance, neighbor))
+                if distance == distances[neighbor]:
+                    touched.add(neighbor)
 
-        return distances, previous
+        # Pick the neighbor a full run settles first among those on a shortest path
+        ids: Optional[Dict[str, int]] = None
+        for vertex in touched:
+            best = None
+            for neighbor, weight in self.edges[vertex]:
+                if distances[neighbor] + weight != distances[vertex] or neighbor == best:
+                    continue
+                if best is not None:
+                    if ids is None:
+                        ids = {name: vertex_id for vertex_id, name in enumerate(self.edges)}
+                    if (distances[neighbor], ids[neighbor]) > (distances[best], ids[best]):
+                        continue
+                best = neighbor
+            previous[vertex] = best
+
+    def dijkstra_many(
+        self, sources: Optional[Iterable[str]] = None, workers: Optional[int] = None
+    ) -> Iterator[Tuple[str, Dict[str, float]]]:
+        """Compute shortest distances from many sources on a process pool.
+
+        Each worker receives the frozen graph once when it starts. Results are
+        streamed back as they complete, with only a few in flight at a time.
+
+        :param sources: The starting vertices, all vertices by default.
+        :param workers: Number of worker processes, os.cpu_count() by default.
+                        With 1 worker the searches run in this process.
+        :return: Iterator over (source, distances) pairs in order of completion.
+        """
+        csr = self.freeze()
+        source_ids = [csr.ids[source] for source in (csr.names if sources is None else sources)]
+        workers = workers or os.cpu_count() or 1
+
+        if workers == 1:
+            for source in source_ids:
+                distances, _ = csr.dijkstra_ids(source)
+                yield csr.names[source], csr.named_distances(distances)
+            return
+
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(csr,)) as executor:
+            tasks = ((source,) for source in source_ids)
+            for source, raw in _bounded_map(executor, _worker_distances, tasks, 2 * workers):
+                distances = array("d")
+                distances.frombytes(raw)
+                yield csr.names[source], csr.named_distances(distances)
+
+    def distance_matrix(
+        self, path: str, sources: Optional[Iterable[str]] = None, workers: Optional[int] = None
+    ) -> List[str]:
+        """Write the distances from many sources into a memory-mappable file.
+
+        The file holds one row of 8-byte floats (native byte order) per source
+        and one column per vertex, in the order of the returned vertex names.
+        Workers write their rows straight into the file, so memory stays
+        bounded however large the matrix is. Unreachable vertices hold infinity.
+
+        :param path: Path of the matrix file to create.
+        :param sources: The starting vertices, all vertices by default.
+        :param workers: Number of worker processes, os.cpu_count() by default.
+        :return: The vertex names of the columns.
+        """
+        csr = self.freeze()
+        sources = list(csr.names if sources is None else sources)
+        workers = workers or os.cpu_count() or 1
+        with open(path, "wb") as file:
+            file.truncate(len(sources) * len(csr) * array("d").itemsize)
+        if not sources or not len(csr):
+            return list(csr.names)
+
+        tasks = ((row, csr.ids[source]) for row, source in enumerate(sources))
+        if workers == 1:
+            with open(path, "r+b") as file, mmap.mmap(file.fileno(), 0) as matrix:
+                for row, source in tasks:
+                    _write_matrix_row(matrix, csr, row, source)
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(csr, path)) as executor:
+                for _ in _bounded_map(executor, _worker_matrix_row, tasks, 2 * workers):
+                    pass
+        return list(csr.names)
+
+    def contraction_hierarchy(self) -> ContractionHierarchy:
+        """Preprocess the graph into a contraction hierarchy for fast repeated queries.
+
+        The hierarchy is a snapshot: edges added later are not reflected in it.
+
+        :return: The contraction hierarchy.
+        """
+        return ContractionHierarchy.build(self.freeze())
+
+    def set_coordinates(self, vertex: str, x: float, y: float) -> None:
+        """Attach a position to a vertex, used by the default A* heuristic.
+
+        :param vertex: The vertex.
+        :param x: The x-coordinate of the vertex.
+        :param y: The y-coordinate of the vertex.
+        """
+        self.coordinates[vertex] = (x, y)
+
+    def shortest_path(
+        self,
+        source: str,
+        target: str,
+        method: str = "dijkstra",
+        heuristic: Optional[Callable[[str, str], float]] = None,
+    ) -> Tuple[float, List[str], int]:
+        """Find the shortest path between two vertices.
+
+        The search stops as soon as the target is settled.
+
+        :param source: The starting vertex.
+        :param target: The target vertex.
+        :param method: "dijkstra", "bidirectional" or "astar".
+        :param heuristic: For "astar", function estimating the distance between
+                          a vertex and the target. It must never overestimate.
+                          Defaults to the straight-line distance between the
+                          vertex coordinates.
+        :return: A tuple of three values:
+                 - distance: length of the shortest path, infinity if there is none.
+                 - path: list of vertices from source to target, empty if there is none.
+                 - settled: number of vertices settled by the search.
+        """
+        csr = self.freeze()
+        source_id, target_id = csr.ids[source], csr.ids[target]
+
+        if method == "dijkstra":
+            distance, path, settled = csr.shortest_path_ids(source_id, target_id)
+        elif method == "bidirectional":
+            distance, path, settled = csr.bidirectional_ids(source_id, target_id)
+        elif method == "astar":
+            if heuristic is None:
+                if not self.coordinates:
+                    raise ValueError("A* needs a heuristic or vertex coordinates.")
+                heuristic = euclidean_heuristic(self.coordinates)
+            names = csr.names
+            distance, path, settled = csr.shortest_path_ids(
+                source_id, target_id, lambda vertex: heuristic(names[vertex], target)
+            )
+        else:
+            raise ValueError(f"Unknown shortest path method: {method}")
+
+        if csr.integral and distance != float("infinity"):
+            distance = int(distance)
+        return distance, [csr.names[vertex] for vertex in path], settled
 
 
 if __name__ == "__main__":
@@ -83,3 +1308,10 @@ if __name__ == "__main__":
     print(f"Distances from vertex {start_vertex} to all other vertices:")
     for vertex, distance in distances.items():
         print(f"Distance to vertex {vertex}: {distance}")
+
+    for method in ("dijkstra", "bidirectional"):
+        distance, path, settled = graph.shortest_path("A", "E", method=method)
+        print(f"Shortest path A -> E ({method}): {' -> '.join(path)}, distance {distance}, {settled} settled")
+
+    hierarchy = graph.contraction_hierarchy()
+    print(f"Distance A -> E (contraction hierarchy): {hierarchy.distance('A', 'E')}")
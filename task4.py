@@ -1,20 +1,155 @@
-import uuid
-import networkx as nx
-import matplotlib.pyplot as plt
+import operator
+from array import array
+from typing import Any, Iterable, Optional, Union
 
-from shared_funcs import list_to_heap_tree, draw_tree
+from shared_funcs import draw_heap
 
 
-def visualize_heap(heap_list: list[int]) -> None:
+class Heap:
+    def __init__(
+        self, values: Iterable[Any] = (), arity: int = 2, max_heap: bool = False, typecode: Optional[str] = None
+    ) -> None:
+        """Initialize a heap-ordered priority queue stored in a flat array.
+
+        The children of the element at index i are at indices
+        arity * i + 1 to arity * i + arity.
+
+        :param values: Initial values, heapified in O(n).
+        :param arity: Number of children of every element, e.g. 2, 4 or 8.
+        :param max_heap: Keep the largest value on top instead of the smallest.
+        :param typecode: Type code of an array.array used as compact storage
+                         for numeric values, e.g. "q" or "d". A list is used if None.
+        """
+        if arity < 2:
+            raise ValueError("Heap arity must be at least 2.")
+        self.arity = arity
+        self.max_heap = max_heap
+        self._before = operator.gt if max_heap else operator.lt  # Whether a belongs above b
+        self.data: Union[list, array] = array(typecode, values) if typecode else list(values)
+        self.heapify()
+
+    def __len__(self) -> int:
+        """Return the number of values in the heap."""
+        return len(self.data)
+
+    def to_list(self) -> list:
+        """Return the values in heap order, e.g. for visualize_heap."""
+        return list(self.data)
+
+    def heapify(self) -> None:
+        """Restore the heap order of the whole array bottom-up in O(n)."""
+        for index in reversed(range((len(self.data) - 2) // self.arity + 1)):
+            self._sift_down(index)
+
+    def peek(self) -> Any:
+        """Return the top value without removing it."""
+        if not self.data:
+            raise IndexError("peek from an empty heap")
+        return self.data[0]
+
+    def push(self, value: Any) -> None:
+        """Add a value to the heap.
+
+        :param value: The value to add.
+        """
+        self.data.append(value)
+        self._sift_up(len(self.data) - 1)
+
+    def pop(self) -> Any:
+        """Remove and return the top value."""
+        if not self.data:
+            raise IndexError("pop from an empty heap")
+        last = self.data.pop()
+        if not self.data:
+            return last
+        top = self.data[0]
+        self.data[0] = last
+        self._sift_down(0)
+        return top
+
+    def pushpop(self, value: Any) -> Any:
+        """Push a value and then pop the top value, faster than push followed by pop.
+
+        :param value: The value to add.
+        :return: The top value, which may be the pushed value itself.
+        """
+        if self.data and self._before(self.data[0], value):
+            value, self.data[0] = self.data[0], value
+            self._sift_down(0)
+        return value
+
+    def replace(self, value: Any) -> Any:
+        """Pop the top value and then push a value, faster than pop followed by push.
+
+        :param value: The value to add.
+        :return: The previous top value.
+        """
+        if not self.data:
+            raise IndexError("replace on an empty heap")
+        top = self.data[0]
+        self.data[0] = value
+        self._sift_down(0)
+        return top
+
+    def merge(self, other: "Heap") -> "Heap":
+        """Move all values of another heap with the same ordering into this one, in O(n + m).
+
+        :param other: The heap to merge in. It is left empty.
+        :return: This heap.
+        """
+        if other.max_heap != self.max_heap:
+            raise ValueError("Cannot merge a min-heap with a max-heap.")
+        self.data.extend(other.data)
+        del other.data[:]
+        self.heapify()
+        return self
+
+    def _sift_up(self, index: int) -> None:
+        """Move the value at index up until its parent belongs above it."""
+        data, arity, before = self.data, self.arity, self._before
+        value = data[index]
+        while index > 0:
+            parent = (index - 1) // arity
+            if not before(value, data[parent]):
+                break
+            data[index] = data[parent]  # Move the parent down into the hole
+            index = parent
+        data[index] = value
+
+    def _sift_down(self, index: int) -> None:
+        """Move the value at index down until no child belongs above it."""
+        data, arity, before = self.data, self.arity, self._before
+        size = len(data)
+        value = data[index]
+        while True:
+            first_child = arity * index + 1
+            if first_child >= size:
+                break
+            # Find the child that belongs on top
+            best = first_child
+            for child in range(first_child + 1, min(first_child + arity, size)):
+                if before(data[child], data[best]):
+                    best = child
+            if not before(data[best], value):
+                break
+            data[index] = data[best]  # Move the child up into the hole
+            index = best
+        data[index] = value
+
+
+def visualize_heap(heap_list: Union[list[int], Heap]) -> None:
     """
-    Visualize a binary heap by building its tree and drawing it.
+    Visualize a binary heap by drawing it straight from its list.
 
-    :param heap_list: List of integers representing the binary heap.
+    :param heap_list: List of integers representing the binary heap, or a binary Heap.
     """
-    # Build the binary heap tree from the list.
-    heap_tree = list_to_heap_tree(heap_list)
-    if heap_tree is not None:
-        draw_tree(heap_tree)
+    if isinstance(heap_list, Heap):
+        if heap_list.arity != 2:
+            raise ValueError("Only binary heaps can be visualized.")
+        heap_list = heap_list.to_list()
+    if heap_list:
+        # Large heaps are drawn without values, they would not be readable anyway.
+        draw_heap(heap_list, labels=len(heap_list) <= 64)
     else:
         print("Heap is empty.")
 
@@ -24,3 +159,8 @@ if __name__ == "__main__":
     # Example binary heap represented as a list.
     heap_list = [10, 12, 15, 20, 17, 25, 30]
     visualize_heap(heap_list)
+
+    # Example binary heap built from unordered values.
+    heap = Heap([30, 25, 20, 17, 15, 12, 10], typecode="q")
+    heap.push(5)
+    visualize_heap(heap)
@@ -1,6 +1,10 @@
+import os
+import sys
 from collections import deque
 
-from shared_funcs import draw_tree, list_to_heap_tree
+import numpy as np
+
+from shared_funcs import draw_tree, list_to_heap_tree, tree_figure
 
 
 # Функція для генерації кольору за кроком обходу
@@ -10,60 +14,408 @@ def rgb_color(step, max_steps):
     return f"#{intensity:02x}{intensity:02x}{255 - intensity:02x}"
 
 
+# Ітеративний DFS обхід дерева з використанням стека, без малювання
+def iter_dfs(tree_root):
+    """Yield the nodes of the tree in depth-first (pre-order) order."""
+    stack = [tree_root] if tree_root is not None else []
+    while stack:
+        node = stack.pop()
+        yield node
+        # Додаєм спочатку правий вузол, потім лівий (щоб лівий обходився першим)
+        if node.right:
+            stack.append(node.right)
+        if node.left:
+            stack.append(node.left)
+
+
+# Ітеративний BFS обхід дерева з використанням черги, без малювання
+def iter_bfs(tree_root):
+    """Yield the nodes of the tree in breadth-first order."""
+    queue = deque([tree_root] if tree_root is not None else [])
+    while queue:
+        node = queue.popleft()
+        yield node
+        if node.left:
+            queue.append(node.left)
+        if node.right:
+            queue.append(node.right)
+
+
+# Центрований (in-order) обхід дерева з використанням стека
+def iter_inorder(tree_root):
+    """Yield the nodes of the tree in in-order: left subtree, node, right subtree."""
+    stack = []
+    node = tree_root
+    while stack or node is not None:
+        # Спускаємось ліворуч до кінця, запам'ятовуючи шлях
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        yield node
+        node = node.right
+
+
+# Зворотний (post-order) обхід дерева з використанням стека
+def iter_postorder(tree_root):
+    """Yield the nodes of the tree in post-order: both subtrees, then the node."""
+    stack = [(tree_root, False)] if tree_root is not None else []
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            yield node
+            continue
+        # Вузол повернеться зі стека після своїх дітей
+        stack.append((node, True))
+        if node.right:
+            stack.append((node.right, False))
+        if node.left:
+            stack.append((node.left, False))
+
+
+# Обхід дерева по рівнях
+def iter_levels(tree_root):
+    """Yield the levels of the tree from the root down, each as a list of nodes."""
+    level = [tree_root] if tree_root is not None else []
+    while level:
+        yield level
+        level = [child for node in level for child in (node.left, node.right) if child]
+
+
+TRAVERSALS = {
+    "dfs": iter_dfs,
+    "preorder": iter_dfs,
+    "inorder": iter_inorder,
+    "postorder": iter_postorder,
+    "bfs": iter_bfs,
+}
+
+
+# Обходи купи у списку без побудови дерева: діти вузла i мають індекси 2i+1 та 2i+2
+def iter_heap_dfs(heap_list):
+    """Yield the indices of the heap list in depth-first (pre-order) order, using O(height) memory."""
+    size = len(heap_list)
+    stack = [0] if size else []
+    while stack:
+        index = stack.pop()
+        yield index
+        if 2 * index + 2 < size:
+            stack.append(2 * index + 2)
+        if 2 * index + 1 < size:
+            stack.append(2 * index + 1)
+
+
+def iter_heap_inorder(heap_list):
+    """Yield the indices of the heap list in in-order, using O(height) memory."""
+    size = len(heap_list)
+    stack = []
+    index = 0
+    while stack or index < size:
+        while index < size:
+            stack.append(index)
+            index = 2 * index + 1
+        index = stack.pop()
+        yield index
+        index = 2 * index + 2
+
+
+def iter_heap_postorder(heap_list):
+    """Yield the indices of the heap list in post-order, using O(height) memory."""
+    size = len(heap_list)
+    stack = [(0, False)] if size else []
+    while stack:
+        index, expanded = stack.pop()
+        if expanded:
+            yield index
+            continue
+        stack.append((index, True))
+        if 2 * index + 2 < size:
+            stack.append((2 * index + 2, False))
+        if 2 * index + 1 < size:
+            stack.append((2 * index + 1, False))
+
+
+def iter_heap_bfs(heap_list):
+    """Yield the indices of the heap list in breadth-first order, which is the list order."""
+    return iter(range(len(heap_list)))
+
+
+def iter_heap_levels(heap_list):
+    """Yield the levels of the heap list from the root down, each as a range of indices."""
+    start, width = 0, 1
+    while start < len(heap_list):
+        yield range(start, min(start + width, len(heap_list)))
+        start += width
+        width *= 2
+
+
+HEAP_TRAVERSALS = {
+    "dfs": iter_heap_dfs,
+    "preorder": iter_heap_dfs,
+    "inorder": iter_heap_inorder,
+    "postorder": iter_heap_postorder,
+    "bfs": iter_heap_bfs,
+}
+
+
+def colored(traversal, total):
+    """Pair every item of a traversal with its color in the step gradient.
+
+    :param traversal: Iterable of visited nodes or heap indices.
+    :param total: Number of items in the traversal, to size the gradient.
+    :return: Iterator over (item, color) pairs.
+    """
+    for step, item in enumerate(traversal):
+        yield item, rgb_color(step, total)
+
+
+def heap_traversal_colors(heap_list, order="dfs"):
+    """Color every element of the heap list by its step in a traversal.
+
+    :param heap_list: List representing the binary heap.
+    :param order: Traversal order, a key of HEAP_TRAVERSALS.
+    :return: List of colors by heap index, e.g. for shared_funcs.draw_heap.
+    """
+    colors = [None] * len(heap_list)
+    for index, color in colored(HEAP_TRAVERSALS[order](heap_list), len(heap_list)):
+        colors[index] = color
+    return colors
+
+
 # Ітеративний DFS обхід дерева з використанням стека
 def dfs(tree_root):
     if tree_root is None:
         return
-    stack = [tree_root]
-    step = 0
     max_steps = count_nodes(tree_root)
 
-    while stack:
-        node = stack.pop()
+    for step, node in enumerate(iter_dfs(tree_root)):
         # Присвоюємо вузлу колір, що залежить від порядку обходу
         node.color = rgb_color(step, max_steps)
         print("Press Enter to continue..." if step > 0 else "Press Enter to start...")
         _ = input()
         draw_tree(tree_root)
-        step += 1
-        # Додаєм спочатку правий вузол, потім лівий (щоб лівий обходився першим)
-        if node.right:
-            stack.append(node.right)
-        if node.left:
-            stack.append(node.left)
 
 
 # Ітеративний BFS обхід дерева з використанням черги
 def bfs(tree_root):
     if tree_root is None:
         return
-    queue = deque([tree_root])
-    step = 0
     max_steps = count_nodes(tree_root)
 
-    while queue:
-        node = queue.popleft()
+    for step, node in enumerate(iter_bfs(tree_root)):
         node.color = rgb_color(step, max_steps)
         print("Press Enter to continue..." if step > 0 else "Press Enter to start...")
         input()
         draw_tree(tree_root)
-        step += 1
-        if node.left:
-            queue.append(node.left)
-        if node.right:
-            queue.append(node.right)
+
+
+def traversal_frames(tree_root, order="dfs", labels=True):
+    """Render the frames of a traversal animation offscreen, one per visited node.
+
+    The tree is drawn once. Every step restores only the box around the
+    visited node from a background holding the edges, redraws the nodes that
+    reach into it and blends in the labels from a layer rendered once. A frame
+    costs about the same however large the tree is, and matches a full redraw
+    up to rounding of antialiased pixels.
+
+    :param tree_root: The root node of the tree.
+    :param order: Traversal order, a key of TRAVERSALS.
+    :param labels: Whether to print the values on the nodes.
+    :return: Iterator over (frame, box) pairs: the RGBA canvas as an array of
+             shape (height, width, 4), valid until the next step, and the
+             (left, top, right, bottom) pixel box that changed since the
+             previous frame, the whole canvas for the first one.
+    """
+    from matplotlib.colors import to_rgba
+    from matplotlib.transforms import Bbox
+
+    if tree_root is None:
+        return
+    figure, collection, node_ids, texts = tree_figure(tree_root, labels=labels)
+    canvas, ax = figure.canvas, collection.axes
+    index = {node_id: i for i, node_id in enumerate(node_ids)}
+    face_colors = collection.get_facecolors().copy()
+    offsets = collection.get_offsets().copy()
+    width, height = canvas.get_width_height()
+
+    # Background with the edges only
+    for artist in [collection, *texts]:
+        artist.set_visible(False)
+    canvas.draw()
+    background = canvas.copy_from_bbox(figure.bbox)
+    # Labels alone on a transparent canvas, to be blended over the nodes
+    label_rgb = label_alpha = None
+    if texts:
+        hidden = [figure.patch, *ax.collections, *ax.patches, *ax.lines]
+        for artist in hidden:
+            artist.set_visible(False)
+        for text in texts:
+            text.set_visible(True)
+        canvas.draw()
+        layer = np.asarray(canvas.buffer_rgba()).astype(np.float32) / 255
+        label_rgb, label_alpha = layer[:, :, :3] * 255, layer[:, :, 3:]
+        for artist in hidden:
+            artist.set_visible(True)
+    collection.set_visible(True)
+
+    # Display box of every node marker, in whole pixels with a margin for antialiasing
+    centers = ax.transData.transform(offsets)
+    points = figure.dpi / 72
+    radius = np.sqrt(np.max(collection.get_sizes())) / 2 * points + np.max(collection.get_linewidths()) * points
+    lower = np.maximum(np.floor(centers - radius) - 2, 0)
+    upper = np.minimum(np.ceil(centers + radius) + 2, (width, height))
+    node_boxes = np.hstack((lower, upper)).astype(int)
+
+    frame = None
+    for node, color in colored(TRAVERSALS[order](tree_root), len(node_ids)):
+        node.color = color
+        face_colors[index[node.id]] = to_rgba(node.color)
+        if frame is None:
+            collection.set_facecolor(face_colors)
+            canvas.draw()
+            for text in texts:
+                text.set_visible(False)  # Blended in from the layer from now on
+            frame = np.asarray(canvas.buffer_rgba())
+            yield frame, (0, 0, width, height)
+            continue
+
+        x0, y0, x1, y1 = node_boxes[index[node.id]].tolist()
+        # The restored box counts from the top and includes its last row and column
+        canvas.restore_region(background, bbox=(x0, height - y1, x1 - 1, height - y0 - 1), xy=(0, 0))
+        # Redraw only the nodes reaching into the box, in their original order;
+        # all nodes share one size, so offsets and colors are all that changes
+        near = np.flatnonzero(
+            (node_boxes[:, 0] < x1) & (node_boxes[:, 2] > x0) & (node_boxes[:, 1] < y1) & (node_boxes[:, 3] > y0)
+        )
+        if len(near) == 1:
+            # A single marker is drawn by another Agg routine with other rounding,
+            # so add one from outside the box, which the clip removes entirely
+            near = np.append(near, (near[0] + 1) % len(node_ids))
+        collection.set_offsets(offsets[near])
+        collection.set_facecolor(face_colors[near])
+        collection.set_clip_box(Bbox.intersection(Bbox([[x0, y0], [x1, y1]]), ax.bbox))
+        ax.draw_artist(collection)
+        # Rows of the buffer count from the top
+        top, bottom = height - y1, height - y0
+        if texts:
+            box = frame[top:bottom, x0:x1, :3]
+            alpha = label_alpha[top:bottom, x0:x1]
+            box[:] = label_rgb[top:bottom, x0:x1] * alpha + box * (1 - alpha) + 0.5
+        yield frame, (x0, top, x1, bottom)
+
+
+def _write_gif(path, frames, fps):
+    """Stream traversal frames to a GIF file, storing only the changed box of each frame.
+
+    :param path: Output file.
+    :param frames: Iterator over (frame, box) pairs, see traversal_frames.
+    :param fps: Frames per second of the animation.
+    """
+    from PIL import GifImagePlugin, Image
+
+    duration = round(1000 / fps)
+    with open(path, "wb") as file:
+        for step, (frame, (left, top, right, bottom)) in enumerate(frames):
+            image = Image.fromarray(frame[top:bottom, left:right, :3]).quantize()
+            if step == 0:
+                header, _ = GifImagePlugin.getheader(image, info={"loop": 0, "duration": duration})
+                file.write(b"".join(header))
+            # Every frame after the first one brings its own palette
+            data = GifImagePlugin.getdata(image, (left, top), duration=duration, include_color_table=step > 0)
+            file.write(b"".join(data))
+        file.write(b";")  # GIF trailer
+
+
+def _write_video(path, frames, fps):
+    """Pipe traversal frames to ffmpeg as raw RGBA video.
+
+    :param path: Output file.
+    :param frames: Iterator over (frame, box) pairs, see traversal_frames.
+    :param fps: Frames per second of the animation.
+    """
+    import subprocess
+
+    from matplotlib import rcParams
+
+    process = None
+    try:
+        for frame, _ in frames:
+            if process is None:
+                height, width = frame.shape[:2]
+                command = [
+                    rcParams["animation.ffmpeg_path"], "-f", "rawvideo", "-vcodec", "rawvideo",
+                    "-s", f"{width}x{height}", "-pix_fmt", "rgba", "-framerate", str(fps), "-loglevel", "error",
+                    "-i", "pipe:", "-vcodec", "h264", "-pix_fmt", "yuv420p",
+                    "-vf", "scale=trunc(iw/2)*2:trunc(ih/2)*2", "-y", path,
+                ]  # fmt: skip
+                process = subprocess.Popen(command, stdin=subprocess.PIPE)
+            process.stdin.write(frame.tobytes())
+    finally:
+        if process is not None:
+            process.stdin.close()
+            if process.wait():
+                raise RuntimeError(f"ffmpeg failed to write {path}")
+
+
+def export_traversal(tree_root, path, order="dfs", fps=5, labels=True):
+    """Write a traversal animation to a file without a display or user input.
+
+    Frames come from traversal_frames and are streamed to the file, so
+    memory does not grow with the number of frames.
+
+    :param tree_root: The root node of the tree.
+    :param path: Output file: ".gif" (Pillow), ".mp4" (needs ffmpeg), or a
+                 directory without extension for numbered PNG frames.
+    :param order: Traversal order, a key of TRAVERSALS.
+    :param fps: Frames per second of the animation.
+    :param labels: Whether to print the values on the nodes.
+    :return: Number of frames written.
+    """
+    from matplotlib.image import imsave
+
+    if tree_root is None:
+        return 0
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix not in (".gif", ".mp4", ""):
+        raise ValueError(f"Unsupported animation format: {suffix}")
+
+    count = 0
+
+    def counted(frames):
+        nonlocal count
+        for count, item in enumerate(frames, 1):
+            yield item
+
+    frames = counted(traversal_frames(tree_root, order, labels))
+    if suffix == ".gif":
+        _write_gif(path, frames, fps)
+    elif suffix == ".mp4":
+        _write_video(path, frames, fps)
+    else:
+        os.makedirs(path, exist_ok=True)
+        for step, (frame, _) in enumerate(frames):
+            imsave(os.path.join(path, f"frame_{step:05d}.png"), frame)
+    return count
 
 
 def count_nodes(node):
     """Count nodes in the tree."""
-    if node is None:
-        return 0
-    return 1 + count_nodes(node.left) + count_nodes(node.right)
+    return sum(1 for _ in iter_dfs(node))
 
 
 if __name__ == "__main__":
     # Приклад: створення бінарного дерева з купи
     heap_list = [0, 1, 2, 3, 4, 5, 6]
+
+    if len(sys.argv) > 1:
+        # Неінтерактивний режим: python task5.py traversal.gif -> traversal_dfs.gif, traversal_bfs.gif
+        stem, suffix = os.path.splitext(sys.argv[1])
+        for order in ("dfs", "bfs"):
+            output = f"{stem}_{order}{suffix}"
+            export_traversal(list_to_heap_tree(heap_list), output, order)
+            print(f"{order.upper()} traversal saved to {output}")
+        sys.exit()
+
     heap_tree_root = list_to_heap_tree(heap_list)
 
     print("DFS traversal visualization:")
@@ -1,3 +1,10 @@
+import math
+import numbers
+from bisect import bisect_right
+from collections import OrderedDict
+
+import numpy as np
+
 ITEMS = {
     "pizza": {"cost": 50, "calories": 300},
     "hamburger": {"cost": 40, "calories": 250},
@@ -16,56 +23,441 @@ def greedy_algorithm(items: dict, budget: int) -> tuple[list[str], int]:
     :return: Tuple with selected products and total calories.
     """
 
-    # Sort items based on the ratio of calories to cost
-    sorted_items = sorted(items.items(), key=lambda x: x[1]["calories"] / x[1]["cost"], reverse=True)
+    names, costs, calories = _catalog(items)
 
     total_cost = 0
     total_calories = 0
     chosen_items = []
 
-    for item, properties in sorted_items:
-        if total_cost + properties["cost"] <= budget:
-            chosen_items.append(item)
-            total_cost += properties["cost"]
-            total_calories += properties["calories"]
+    # Take items by the ratio of calories to cost
+    for i in _ratio_order(costs, calories):
+        if total_cost + costs[i] <= budget:
+            chosen_items.append(names[i])
+            total_cost += costs[i]
+            total_calories += calories[i]
 
     return chosen_items, total_calories
 
 
-def dynamic_programming(items, budget):
+def _ratio_order(costs, calories):
+    """Return the item indices sorted by the ratio of calories to cost, the best first."""
+    return sorted(range(len(costs)), key=lambda i: calories[i] / costs[i], reverse=True)
+
+
+def dynamic_programming(items, budget, leaf_size=32):
     """Dynamic programming algorithm to select products based on budget.
 
+    The table is never stored: one row of best calories per budget is
+    updated item by item with vectorized shifted maxima. The chosen items
+    are recovered by divide and conquer, which recomputes the rows it
+    needs instead of keeping the table, and gives the same selection as
+    a traceback through the full table.
+
     :param items: Dictionary with products
     :param budget: Budget that can be spent on products.
+    :param leaf_size: Number of items whose decisions are stored at once,
+                      in a boolean table of leaf_size rows.
     :return: Tuple with selected products and total calories.
     """
 
+    names, costs, calories = _catalog(items)
+    chosen = _solve_by_cost(costs, calories, budget, leaf_size)
+
+    chosen_items = [names[i] for i in chosen]
+    total_calories = sum(calories[i] for i in chosen)
+    return chosen_items, total_calories
+
+
+def _catalog(items):
+    """Split a catalog into lists of names, costs and calories in the same order."""
     names = list(items.keys())
     costs = [items[name]["cost"] for name in names]
     calories = [items[name]["calories"] for name in names]
+    return names, costs, calories
+
+
+class KnapsackTable:
+    def __init__(self, items, max_budget, leaf_size=32, keep_decisions=False):
+        """Solve the knapsack once for every budget from 0 to max_budget.
 
-    n = len(names)
-    dp = [[0 for _ in range(budget + 1)] for _ in range(n + 1)]
+        The best calories for all budgets come from a single row. By default
+        the chosen items of a budget are found by a divide-and-conquer solve
+        for that budget, the same one dynamic_programming runs, and kept.
+        With keep_decisions the table also keeps, for every item and budget,
+        one bit telling whether the item is taken, packed with np.packbits:
+        n x (max_budget + 1) bits in total, e.g. 12.5 MB for 1000 items and a
+        budget of 10**5. The chosen items of any budget are then traced from
+        these bits in O(n) without solving again.
 
-    # Заповнюємо таблицю dp
-    for i in range(1, n + 1):
-        for w in range(1, budget + 1):
-            if costs[i - 1] <= w:
-                dp[i][w] = max(dp[i - 1][w], dp[i - 1][w - costs[i - 1]] + calories[i - 1])
+        :param items: Dictionary with products
+        :param max_budget: The largest budget that will be asked for.
+        :param leaf_size: Number of items whose decisions are stored at once while tracing back.
+        :param keep_decisions: Whether to keep the packed decision bits of every item.
+        """
+        self.names, self.costs, self.calories = _catalog(items)
+        self.max_budget = max_budget
+        self.leaf_size = leaf_size
+        self.row = np.zeros(max_budget + 1, dtype=np.result_type(*self.calories, np.int64))
+        self.decisions = None
+        if keep_decisions:
+            # Row i holds the take bits of item i, the bit of budget b at b // 8, from the high bit
+            self.decisions = np.empty((len(self.names), (max_budget + 8) // 8), dtype=np.uint8)
+            take = np.empty(max_budget + 1, dtype=bool)
+        for i, (cost, calories) in enumerate(zip(self.costs, self.calories)):
+            if self.decisions is None:
+                _add_item(self.row, cost, calories)
             else:
-                dp[i][w] = dp[i - 1][w]
+                _add_item(self.row, cost, calories, take)
+                self.decisions[i] = np.packbits(take)
+        self._chosen = {}  # Chosen items by budget, once found
 
-    # Відновлюємо вибрані елементи
-    w = budget
-    chosen_items = []
-    total_calories = dp[n][budget]
+    def _check(self, budget):
+        """Raise ValueError if the budget is outside the solved range."""
+        if not 0 <= budget <= self.max_budget:
+            raise ValueError(f"Budget {budget} is outside the solved range 0..{self.max_budget}.")
 
-    for i in range(n, 0, -1):
-        if dp[i][w] != dp[i - 1][w]:
-            chosen_items.append(names[i - 1])
-            w -= costs[i - 1]
+    def total_calories(self, budget):
+        """Return the best total calories for a budget.
+
+        :param budget: Budget that can be spent on products.
+        :return: Total calories, like the second value of dynamic_programming.
+        """
+        self._check(budget)
+        return self.row[budget].item()
+
+    def chosen_items(self, budget):
+        """Return the products chosen for a budget, the same as dynamic_programming chooses.
+
+        Without the decision bits every new budget costs a solve of its own.
+
+        :param budget: Budget that can be spent on products.
+        :return: List of selected products.
+        """
+        self._check(budget)
+        if budget not in self._chosen:
+            chosen = []
+            if self.decisions is not None:
+                # The same traceback as through the full table, from the last item to the first
+                left = budget
+                for i in reversed(range(len(self.names))):
+                    if self.decisions[i, left >> 3] >> (7 - (left & 7)) & 1:
+                        chosen.append(i)
+                        left -= self.costs[i]
+            else:
+                row = np.zeros(budget + 1, dtype=self.row.dtype)
+                _trace_back(self.costs, self.calories, 0, len(self.names), row, budget, chosen, self.leaf_size)
+            self._chosen[budget] = [self.names[i] for i in chosen]
+        return list(self._chosen[budget])
+
+    def solve(self, budget):
+        """Answer one budget in the format of dynamic_programming.
+
+        :param budget: Budget that can be spent on products.
+        :return: Tuple with selected products and total calories.
+        """
+        return self.chosen_items(budget), self.total_calories(budget)
+
+
+# Solved tables by catalog contents, the least recently used first
+TABLE_CACHE_SIZE = 16
+_tables = OrderedDict()
 
-    return chosen_items, total_calories
+
+def budget_table(items, max_budget, keep_decisions=False):
+    """Return a KnapsackTable for the catalog, reusing an earlier solve if possible.
+
+    Tables are cached by the contents of the catalog, so a dict that has not
+    changed is not solved again, while any change to it gives a new solve.
+    A cached table is reused for every budget up to the one it was solved for,
+    and a table with decision bits also where none were asked for.
+
+    :param items: Dictionary with products
+    :param max_budget: The largest budget that will be asked for.
+    :param keep_decisions: Whether the table must keep the packed decision bits, see KnapsackTable.
+    :return: The table, e.g. budget_table(ITEMS, 100).solve(50).
+    """
+    key = tuple((name, item["cost"], item["calories"]) for name, item in items.items())
+    table = _tables.get(key)
+    if table is None or table.max_budget < max_budget or (keep_decisions and table.decisions is None):
+        table = KnapsackTable(items, max_budget, keep_decisions=keep_decisions)
+    _tables[key] = table
+    _tables.move_to_end(key)
+    while len(_tables) > TABLE_CACHE_SIZE:
+        _tables.popitem(last=False)
+    return table
+
+
+def _add_item(row, cost, calories, take=None):
+    """Update a row of best calories per budget in place with one more item.
+
+    :param row: Best calories for every budget from 0 to len(row) - 1.
+    :param cost: Cost of the item.
+    :param calories: Calories of the item.
+    :param take: Optional boolean array, set where taking the item is strictly better.
+    """
+    # Budget 0 never takes an item, like in the full table
+    first = max(cost, 1)
+    if take is not None:
+        take[: min(first, len(row))] = False
+    if first >= len(row):
+        return
+    with_item = row[first - cost : len(row) - cost] + calories
+    if take is not None:
+        np.greater(with_item, row[first:], out=take[first:])
+    np.maximum(row[first:], with_item, out=row[first:])
+
+
+def _trace_back(costs, calories, lo, hi, row, budget, chosen, leaf_size):
+    """Find which of the items lo..hi - 1 the table traceback takes.
+
+    The traceback goes from the last item to the first and takes an item
+    only if it strictly improves the best calories for the budget left.
+    The later half of the items is traced first, from the row after the
+    earlier half; the earlier half is then traced from the given row.
+
+    :param row: Best calories per budget using the items before lo; it is not changed.
+    :param budget: Budget left when the traceback reaches item hi - 1.
+    :param chosen: List the indices of taken items are appended to, last item first.
+    :return: Budget left for the items before lo.
+    """
+    if hi - lo <= leaf_size:
+        take = np.empty((hi - lo, budget + 1), dtype=bool)
+        current = row[: budget + 1].copy()
+        for i in range(lo, hi):
+            _add_item(current, costs[i], calories[i], take[i - lo])
+        for i in reversed(range(lo, hi)):
+            if take[i - lo, budget]:
+                chosen.append(i)
+                budget -= costs[i]
+        return budget
+
+    mid = (lo + hi) // 2
+    # The traceback never gains budget, so only the entries up to budget are needed
+    upper = row[: budget + 1].copy()
+    for i in range(lo, mid):
+        _add_item(upper, costs[i], calories[i])
+    budget = _trace_back(costs, calories, mid, hi, upper, budget, chosen, leaf_size)
+    del upper
+    return _trace_back(costs, calories, lo, mid, row, budget, chosen, leaf_size)
+
+
+def _solve_by_cost(costs, calories, budget, leaf_size=32):
+    """Solve the knapsack with a row indexed by cost, from 0 to the budget.
+
+    :return: Indices of the chosen items, the last item first.
+    """
+    chosen = []
+    row = np.zeros(budget + 1, dtype=np.result_type(*calories, np.int64))
+    _trace_back(costs, calories, 0, len(costs), row, budget, chosen, leaf_size)
+    return chosen
+
+
+def _solve_by_calories(costs, calories, budget, leaf_size=32):
+    """Solve the knapsack with a row indexed by calories, of the lowest cost reaching each total.
+
+    Its size follows the total calories of the catalog instead of the budget.
+
+    :return: Indices of the chosen items, the last item first.
+    """
+    row = np.full(sum(value for value in calories if value > 0) + 1, np.inf)
+    row[0] = 0
+    for cost, value in zip(costs, calories):
+        _add_item_by_calories(row, cost, value)
+    # The most calories that fit in the budget
+    best = int(np.flatnonzero(row <= budget)[-1])
+    del row
+
+    chosen = []
+    row = np.full(best + 1, np.inf)
+    row[0] = 0
+    _trace_back_by_calories(costs, calories, 0, len(costs), row, best, budget, chosen, leaf_size)
+    return chosen
+
+
+def _add_item_by_calories(row, cost, calories):
+    """Update a row of the lowest cost reaching at least each total of calories in place with one more item.
+
+    :param row: Lowest cost for every total of calories from 0 to len(row) - 1, inf if it cannot be reached.
+    :param cost: Cost of the item.
+    :param calories: Calories of the item.
+    """
+    if calories <= 0:
+        return
+    size = len(row)
+    if calories < size:
+        with_item = row[: size - calories] + cost
+        np.minimum(row[calories:], with_item, out=row[calories:])
+    # Totals below the calories of the item are reached by the item alone
+    np.minimum(row[1 : min(calories, size)], cost, out=row[1 : min(calories, size)])
+
+
+def _trace_back_by_calories(costs, calories, lo, hi, row, needed, budget, chosen, leaf_size):
+    """Find which of the items lo..hi - 1 the table traceback takes, from rows indexed by calories.
+
+    Going from the last item to the first, an item is skipped if the items
+    before it still reach the calories needed within the budget left, which
+    is the same choice the traceback through the cost table makes.
+
+    :param row: Lowest cost per total of calories using the items before lo; it is not changed.
+    :param needed: Calories still needed when the traceback reaches item hi - 1.
+    :param budget: Budget left when the traceback reaches item hi - 1.
+    :param chosen: List the indices of taken items are appended to, last item first.
+    :return: Tuple with the calories needed and the budget left for the items before lo.
+    """
+    if hi - lo <= leaf_size:
+        rows = np.empty((hi - lo, needed + 1))
+        current = row[: needed + 1].copy()
+        for i in range(lo, hi):
+            rows[i - lo] = current
+            _add_item_by_calories(current, costs[i], calories[i])
+        for i in reversed(range(lo, hi)):
+            if rows[i - lo, needed] > budget:
+                chosen.append(i)
+                needed = max(needed - calories[i], 0)
+                budget -= costs[i]
+        return needed, budget
+
+    mid = (lo + hi) // 2
+    # The calories needed never grow, so only the entries up to needed are used
+    upper = row[: needed + 1].copy()
+    for i in range(lo, mid):
+        _add_item_by_calories(upper, costs[i], calories[i])
+    needed, budget = _trace_back_by_calories(costs, calories, mid, hi, upper, needed, budget, chosen, leaf_size)
+    del upper
+    return _trace_back_by_calories(costs, calories, lo, mid, row, needed, budget, chosen, leaf_size)
+
+
+def _solve_by_branch_and_bound(costs, calories, budget, leaf_size=None):
+    """Solve the knapsack by searching selections, with the fractional greedy solution as the bound.
+
+    The first search takes items in the ratio order of greedy_algorithm to
+    find the best total quickly. The second one goes from the last item to
+    the first, trying to skip each item before taking it, and stops at the
+    first selection with the best total, which is the one the table
+    traceback returns. Its running time does not depend on the size of the
+    budget or of the calories.
+
+    :return: Indices of the chosen items, the last item first.
+    """
+    # Items with no calories or over the budget are never taken
+    order = [i for i in _ratio_order(costs, calories) if calories[i] > 0 and costs[i] <= budget]
+    prefix_cost, prefix_calories = [0], [0]
+    for i in order:
+        prefix_cost.append(prefix_cost[-1] + costs[i])
+        prefix_calories.append(prefix_calories[-1] + calories[i])
+
+    def bound(k, capacity):
+        """Best calories of the items order[k:] within capacity, when items may be split."""
+        # Items order[k:j] fit whole, item order[j] only in part
+        j = bisect_right(prefix_cost, prefix_cost[k] + capacity) - 1
+        value = prefix_calories[j] - prefix_calories[k]
+        if j < len(order):
+            value += (capacity - prefix_cost[j] + prefix_cost[k]) * calories[order[j]] / costs[order[j]]
+        return value
+
+    best, best_chosen = 0, None
+    # Every entry is a position in order, the budget left, the calories so far and the taken items
+    stack = [(0, budget, 0, None)]
+    while stack:
+        k, capacity, value, taken = stack.pop()
+        if value > best:
+            best, best_chosen = value, taken
+        if k == len(order) or value + bound(k, capacity) <= best:
+            continue
+        i = order[k]
+        stack.append((k + 1, capacity, value, taken))
+        if costs[i] <= capacity:
+            # Taking the item is tried first
+            stack.append((k + 1, capacity - costs[i], value + calories[i], (i, taken)))
+
+    def bound_up_to(last, capacity):
+        """Best calories of the items 0..last within capacity, when items may be split."""
+        value = 0
+        for i in order:
+            if i <= last:
+                if costs[i] > capacity:
+                    return value + capacity * calories[i] / costs[i]
+                value += calories[i]
+                capacity -= costs[i]
+        return value
+
+    usable = set(order)
+    # Every entry is the last undecided item, the budget left, the calories so far and the taken items
+    stack = [(len(costs) - 1, budget, 0, None)]
+    while stack:
+        last, capacity, value, taken = stack.pop()
+        if value >= best:
+            best_chosen = taken
+            break
+        if last < 0 or value + bound_up_to(last, capacity) < best:
+            continue
+        if last in usable and costs[last] <= capacity:
+            stack.append((last - 1, capacity - costs[last], value + calories[last], (last, taken)))
+        # Skipping the item is tried first
+        stack.append((last - 1, capacity, value, taken))
+
+    chosen = []
+    while best_chosen is not None:
+        i, best_chosen = best_chosen
+        chosen.append(i)
+    return sorted(chosen, reverse=True)
+
+
+STRATEGIES = {
+    "cost": _solve_by_cost,
+    "calories": _solve_by_calories,
+    "branch_and_bound": _solve_by_branch_and_bound,
+}
+
+# Catalogs this small are searched directly, whatever the budget
+BRANCH_AND_BOUND_ITEMS = 20
+# Largest number of items times row length worth filling with a DP
+DP_CELLS = 10**9
+
+
+def choose_strategy(items, budget):
+    """Pick the knapsack strategy that suits the size of the catalog, its prices and the budget.
+
+    The cost-indexed DP is used when its row is shorter than the
+    calorie-indexed one, which is not the case for large budgets or prices
+    in cents. Small catalogs, or ones too large for either DP, are searched
+    with branch and bound. Free items and a zero budget follow the rules
+    of the cost table.
+
+    :param items: Dictionary with products
+    :param budget: Budget that can be spent on products.
+    :return: A key of STRATEGIES.
+    """
+    names, costs, calories = _catalog(items)
+    if budget <= 0 or any(cost <= 0 for cost in costs):
+        return "cost"
+    cost_cells = math.inf
+    if all(isinstance(value, numbers.Integral) for value in (budget, *costs)):
+        cost_cells = len(names) * (budget + 1)
+    calorie_cells = math.inf
+    if all(isinstance(value, numbers.Integral) for value in calories):
+        calorie_cells = len(names) * (sum(value for value in calories if value > 0) + 1)
+    if len(names) <= BRANCH_AND_BOUND_ITEMS or min(cost_cells, calorie_cells) > DP_CELLS:
+        return "branch_and_bound"
+    return "cost" if cost_cells <= calorie_cells else "calories"
+
+
+def knapsack(items, budget, strategy="auto", leaf_size=32):
+    """Select products based on budget with the strategy that suits the input.
+
+    Every strategy returns the same selection as dynamic_programming.
+
+    :param items: Dictionary with products
+    :param budget: Budget that can be spent on products.
+    :param strategy: A key of STRATEGIES, or "auto" to let choose_strategy pick one.
+    :param leaf_size: Number of items whose decisions are stored at once by the DP strategies.
+    :return: Tuple with selected products and total calories.
+    """
+    if strategy == "auto":
+        strategy = choose_strategy(items, budget)
+    names, costs, calories = _catalog(items)
+    chosen = STRATEGIES[strategy](costs, calories, budget, leaf_size)
+    return [names[i] for i in chosen], sum(calories[i] for i in chosen)
 
 
 if __name__ == "__main__":
@@ -80,3 +472,10 @@ if __name__ == "__main__":
     print("Dynamic programming algorithm:")
     print("Chosen food:", chosen_items)
     print("Total Calories:", total_calories)
+
+    # Several budgets answered from one solve
+    table = budget_table(ITEMS, 150)
+    print("Dynamic programming for several budgets:")
+    for tier in (25, 50, 100, 150):
+        chosen_items, total_calories = table.solve(tier)
+        print(f"Budget {tier}: {chosen_items}, {total_calories} calories")
@@ -1,6 +1,11 @@
-import random
-import matplotlib.pyplot as plt
-import pandas as pd
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import repeat
+from statistics import NormalDist
+from typing import Optional
+
+import numpy as np
 
 ANALYTICAL_PROBABILITIES = {
     2: 2.78,  # 1/36
@@ -17,28 +22,230 @@ ANALYTICAL_PROBABILITIES = {
 }
 
 
-def monte_carlo_simulation(num_simulations: int) -> dict[int, float]:
-    """Simulate rolling two dice and calculate the probability of each sum.
+def _count_chunks(
+    entropy: int, chunks: range, num_simulations: int, dice: int, faces: int, chunk_size: int
+) -> np.ndarray:
+    """Count the sums of the given chunks of simulations, each drawn from its own random stream.
+
+    The stream of chunk k is spawned from the root seed with spawn key (k,),
+    so it does not depend on which process draws the chunk.
+
+    :param entropy: Entropy of the root SeedSequence.
+    :param chunks: Indices of the chunks to draw.
+    :return: Array of counts indexed by the sum, from 0 to dice * faces.
+    """
+    counts = np.zeros(dice * faces + 1, dtype=np.int64)
+    roll_type = np.int16 if faces < 2**15 else np.int64
+    sum_type = np.int32 if dice * faces < 2**31 else np.int64
+    for index in chunks:
+        rng = np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(index,)))
+        size = min(chunk_size, num_simulations - index * chunk_size)
+        sums = np.zeros(size, dtype=sum_type)
+        for _ in range(dice):
+            sums += rng.integers(1, faces + 1, size=size, dtype=roll_type)
+        counts += np.bincount(sums, minlength=len(counts))
+    return counts
+
+
+def simulate_sums(
+    num_simulations: int,
+    dice: int = 2,
+    faces: int = 6,
+    chunk_size: int = 1 << 20,
+    seed: Optional[int] = None,
+    workers: Optional[int] = 1,
+) -> np.ndarray:
+    """Roll the dice num_simulations times and count how often each sum comes up.
+
+    Trials are drawn chunk_size at a time, one die after another, and the
+    sums of a chunk are counted with bincount, so memory use does not grow
+    with the number of simulations. Every chunk has its own random stream
+    derived from the seed, and the counts of the chunks are added up, so
+    for a given seed and chunk size the result is the same for any number
+    of workers.
 
     :param num_simulations: The number of simulations to run.
+    :param dice: The number of dice rolled in every simulation.
+    :param faces: The number of faces of every die, numbered from 1.
+    :param chunk_size: The number of simulations drawn at once.
+    :param seed: Seed of the random streams, or None for fresh entropy.
+    :param workers: Number of worker processes, None for os.cpu_count().
+                    With 1 worker the simulation runs in this process.
+    :return: Array of counts indexed by the sum, from 0 to dice * faces.
+    """
+    if dice < 1 or faces < 1:
+        raise ValueError("There must be at least one die with at least one face.")
+    entropy = np.random.SeedSequence(seed).entropy
+    num_chunks = -(-num_simulations // chunk_size)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or num_chunks <= 1:
+        return _count_chunks(entropy, range(num_chunks), num_simulations, dice, faces, chunk_size)
+
+    # A few tasks per worker even out the load
+    step = -(-num_chunks // (4 * workers))
+    tasks = [range(start, min(start + step, num_chunks)) for start in range(0, num_chunks, step)]
+    counts = np.zeros(dice * faces + 1, dtype=np.int64)
+    with ProcessPoolExecutor(workers) as executor:
+        for part in executor.map(
+            _count_chunks,
+            repeat(entropy),
+            tasks,
+            repeat(num_simulations),
+            repeat(dice),
+            repeat(faces),
+            repeat(chunk_size),
+        ):
+            counts += part
+    return counts
+
+
+def monte_carlo_simulation(
+    num_simulations: int,
+    dice: int = 2,
+    faces: int = 6,
+    chunk_size: int = 1 << 20,
+    seed: Optional[int] = None,
+    workers: Optional[int] = 1,
+) -> dict[int, float]:
+    """Simulate rolling the dice and calculate the probability of each sum.
+
+    :param num_simulations: The number of simulations to run.
+    :param dice: The number of dice rolled in every simulation.
+    :param faces: The number of faces of every die.
+    :param chunk_size: The number of simulations drawn at once.
+    :param seed: Seed of the random streams, or None for fresh entropy.
+    :param workers: Number of worker processes, None for os.cpu_count().
     :return: A dictionary with the sum of the dice as keys and the probability as values.
     """
-    sum_counts = {i: 0 for i in range(2, 12 + 1)}
+    counts = simulate_sums(num_simulations, dice, faces, chunk_size, seed, workers)
+    return {sum_val: count / num_simulations * 100 for sum_val, count in enumerate(counts.tolist()) if sum_val >= dice}
 
-    for _ in range(num_simulations):
-        dice1 = random.randint(1, 6)
-        dice2 = random.randint(1, 6)
-        dice_sum = dice1 + dice2
-        sum_counts[dice_sum] += 1
 
-    probabilities = {sum_val: count / num_simulations * 100 for sum_val, count in sum_counts.items()}
-    return probabilities
+def sum_distribution(dice: int = 2, faces: int = 6, method: str = "auto") -> np.ndarray:
+    """Compute the exact probability of every sum of the dice by convolution.
 
+    The distribution of one die is convolved with itself once per die
+    ("direct"), which keeps the tails accurate, or raised to the power of
+    the number of dice in the frequency domain ("fft"), which is faster for
+    many dice with many faces but only accurate to about 1e-16 in absolute terms.
 
-if __name__ == "__main__":
+    :param dice: The number of dice.
+    :param faces: The number of faces of every die, numbered from 1.
+    :param method: "direct", "fft", or "auto" to use direct convolution unless it is too slow.
+    :return: Array of probabilities indexed by the sum, from 0 to dice * faces.
+    """
+    if dice < 1 or faces < 1:
+        raise ValueError("There must be at least one die with at least one face.")
+    if method == "auto":
+        method = "direct" if dice**2 * faces**2 <= 10**9 else "fft"
+    die = np.full(faces + 1, 1 / faces)
+    die[0] = 0
+    if method == "direct":
+        probabilities = np.ones(1)
+        for _ in range(dice):
+            probabilities = np.convolve(probabilities, die)
+        return probabilities
+    if method == "fft":
+        size = dice * faces + 1
+        probabilities = np.fft.irfft(np.fft.rfft(die, size) ** dice, size)
+        # Rounding noise shows up as tiny negative values and values below the smallest sum
+        probabilities[probabilities < 0] = 0
+        probabilities[:dice] = 0
+        return probabilities
+    raise ValueError(f"Unknown method: {method}")
 
-    num_simulations = 100000
-    simulated_probabilities = monte_carlo_simulation(num_simulations)
+
+def exact_probabilities(dice: int = 2, faces: int = 6, method: str = "auto") -> dict[int, float]:
+    """Calculate the exact probability of each sum, in the format of ANALYTICAL_PROBABILITIES.
+
+    :param dice: The number of dice.
+    :param faces: The number of faces of every die.
+    :param method: Convolution method of sum_distribution.
+    :return: A dictionary with the sum of the dice as keys and the probability in percent as values.
+    """
+    probabilities = sum_distribution(dice, faces, method)
+    return {sum_val: probability * 100 for sum_val, probability in enumerate(probabilities.tolist()) if sum_val >= dice}
+
+
+def adaptive_simulation(
+    dice: int = 2,
+    faces: int = 6,
+    target_error: float = 0.05,
+    confidence: float = 0.95,
+    chunk_size: int = 1 << 20,
+    seed: Optional[int] = None,
+    max_simulations: int = 10**10,
+    workers: Optional[int] = 1,
+) -> tuple[dict[int, float], int]:
+    """Simulate rolling the dice until every probability is known to within target_error.
+
+    After every round of chunks, the confidence interval of each simulated
+    probability is compared with the exact distribution, and the simulation
+    stops once every interval lies within target_error of the exact value.
+    Chunks use the same random streams as simulate_sums, so the counts equal
+    those of simulate_sums with the same seed and the returned number of
+    simulations.
+
+    :param dice: The number of dice rolled in every simulation.
+    :param faces: The number of faces of every die.
+    :param target_error: Largest allowed error, in percentage points.
+    :param confidence: Confidence level of the intervals.
+    :param chunk_size: The number of simulations drawn at once.
+    :param seed: Seed of the random streams, or None for fresh entropy.
+    :param max_simulations: The simulation stops after this many simulations in any case.
+    :param workers: Number of worker processes, None for os.cpu_count(); each round draws one chunk per worker.
+    :return: Tuple with the dictionary of probabilities in percent and the number of simulations run.
+    """
+    exact = sum_distribution(dice, faces)[dice:]
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    entropy = np.random.SeedSequence(seed).entropy
+    workers = workers or os.cpu_count() or 1
+    counts = np.zeros(dice * faces + 1, dtype=np.int64)
+    num_simulations = 0
+    next_chunk = 0
+
+    with ProcessPoolExecutor(workers) if workers > 1 else nullcontext() as executor:
+        while num_simulations < max_simulations:
+            # The last chunk is cut short at max_simulations
+            limit = min(max_simulations, (next_chunk + workers) * chunk_size)
+            chunks = range(next_chunk, -(-limit // chunk_size))
+            if executor is None:
+                counts += _count_chunks(entropy, chunks, limit, dice, faces, chunk_size)
+            else:
+                for part in executor.map(
+                    _count_chunks,
+                    repeat(entropy),
+                    [range(index, index + 1) for index in chunks],
+                    repeat(limit),
+                    repeat(dice),
+                    repeat(faces),
+                    repeat(chunk_size),
+                ):
+                    counts += part
+            next_chunk = chunks.stop
+            num_simulations = limit
+
+            simulated = counts[dice:] / num_simulations
+            half_width = z * np.sqrt(simulated * (1 - simulated) / num_simulations)
+            if np.all(np.abs(simulated - exact) + half_width <= target_error / 100):
+                break
+
+    probabilities = {
+        sum_val: count / num_simulations * 100 for sum_val, count in enumerate(counts.tolist()) if sum_val >= dice
+    }
+    return probabilities, num_simulations
+
+
+def report(simulated_probabilities: dict[int, float]) -> None:
+    """Plot simulated probabilities against the analytical ones and print them as a table.
+
+    matplotlib and pandas are imported here, so the simulation itself loads only numpy.
+
+    :param simulated_probabilities: Probability of every sum of two dice in percent.
+    """
+    import matplotlib.pyplot as plt
+    import pandas as pd
 
     # Compare analytical and simulated probabilities
     sums = list(ANALYTICAL_PROBABILITIES.keys())
@@ -62,3 +269,10 @@ if __name__ == "__main__":
     }
     df = pd.DataFrame(table_data)
     print(df)
+
+
+if __name__ == "__main__":
+
+    num_simulations = 100000
+    simulated_probabilities = monte_carlo_simulation(num_simulations)
+    report(simulated_probabilities)